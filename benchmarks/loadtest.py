@@ -0,0 +1,361 @@
+"""
+[RU]
+Нагрузочное тестирование бота.
+
+Запускает локальную замену Telegram Bot API на aiohttp, создает временную
+базу данных с анкетой и прогоняет через диспетчер из main.py сценарии
+виртуальных пользователей: /start, ввод имени, просмотр примеров работ,
+полную анкету и отправку телефона. Сценарии генерируются с фиксированным
+seed, поэтому прогоны повторяемы и их можно сравнивать между собой.
+
+Выводит p50/p95/p99 времени обработки и количество обновлений в секунду
+по каждому обработчику.
+
+Запуск из корня проекта:
+    python benchmarks/loadtest.py --users 200 --concurrency 50
+    python benchmarks/loadtest.py --storage memory --api-latency 30 --json result.json
+
+[EN]
+Bot load testing.
+
+Starts a local aiohttp stand-in for the Telegram Bot API, creates a
+temporary database with a questionnaire and replays virtual user
+journeys through the dispatcher from main.py: /start, the name step,
+portfolio browsing, the full interview and the phone step. Journeys are
+generated with a fixed seed, so runs are repeatable and comparable.
+
+Prints p50/p95/p99 processing time and updates per second per handler.
+
+Run from the project root:
+    python benchmarks/loadtest.py --users 200 --concurrency 50
+    python benchmarks/loadtest.py --storage memory --api-latency 30 --json result.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from itertools import count
+from pathlib import Path
+from typing import Any, Optional
+
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parent.parent
+
+QUESTIONS = (
+    ('Какой сайт Вам нужен?', ('Лендинг', 'Интернет-магазин', 'Корпоративный сайт')),
+    ('Есть ли у Вас готовый дизайн?', ('Да', 'Нет')),
+    ('Опишите Ваш проект', ()),
+    ('Когда нужен сайт?', ('В течение месяца', 'Не срочно')),
+)
+MANAGERS_GROUP_ID = -100
+
+_handled: ContextVar[Optional[list[str]]] = ContextVar('handled', default=None)
+
+
+class FakeTelegramAPI:
+    """
+    [RU]
+    Локальная замена Telegram Bot API.
+
+    Отвечает на методы, которые использует бот, правдоподобными
+    результатами и считает вызовы по методам.
+
+    [EN]
+    Local Telegram Bot API stand-in.
+
+    Answers the methods used by the bot with plausible results
+    and counts calls by method.
+    """
+
+    def __init__(self, latency: float = 0):
+        """
+        [RU]
+        Args:
+            latency (float): Искусственная задержка ответа, сек
+
+        [EN]
+        Args:
+            latency (float): Artificial response delay, s
+        """
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        self.url: Optional[str] = None
+        self._ids = count(1)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_post('/bot{token}/{method}', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host='127.0.0.1', port=0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}'
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    def _message(self, chat_id: int, **fields: Any) -> dict:
+        return {
+            'message_id': next(self._ids),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private' if chat_id > 0 else 'supergroup'},
+            'from': {'id': 1, 'is_bot': True, 'first_name': 'Bot'},
+            **fields,
+        }
+
+    def _result(self, method: str, data) -> Any:
+        chat_id = int(data.get('chat_id', 0))
+        if method == 'getMe':
+            return {'id': 1, 'is_bot': True, 'first_name': 'Bot', 'username': 'loadtest_bot'}
+        if method in ('sendMessage', 'editMessageText'):
+            return self._message(chat_id, text=data.get('text', ''))
+        if method == 'sendDocument':
+            return self._message(chat_id, document={'file_id': f'doc{next(self._ids)}', 'file_unique_id': 'doc'})
+        if method == 'sendMediaGroup':
+            return [
+                self._message(chat_id, photo=[{
+                    'file_id': f'photo{next(self._ids)}', 'file_unique_id': 'photo', 'width': 1, 'height': 1,
+                }])
+                for _ in json.loads(data['media'])
+            ]
+        return True
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        data = await request.post()
+        self.calls[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.json_response({'ok': True, 'result': self._result(method, data)})
+
+
+class VirtualUser:
+    """
+    [RU]
+    Виртуальный пользователь, формирующий обновления Telegram.
+
+    [EN]
+    Virtual user producing Telegram updates.
+    """
+
+    _update_ids = count(1)
+    _message_ids = count(1_000_000)
+
+    def __init__(self, user_id: int):
+        self.user = {'id': user_id, 'is_bot': False, 'first_name': f'User{user_id}', 'username': f'user{user_id}'}
+        self.chat = {'id': user_id, 'type': 'private', 'first_name': f'User{user_id}'}
+
+    def message(self, **fields: Any) -> dict:
+        return {'update_id': next(self._update_ids), 'message': {
+            'message_id': next(self._message_ids), 'date': int(time.time()),
+            'chat': self.chat, 'from': self.user, **fields,
+        }}
+
+    def callback(self, data: str) -> dict:
+        message_id = next(self._message_ids)
+        return {'update_id': next(self._update_ids), 'callback_query': {
+            'id': str(message_id), 'from': self.user, 'chat_instance': str(self.chat['id']), 'data': data,
+            'message': {
+                'message_id': message_id, 'date': int(time.time()), 'chat': self.chat,
+                'from': {'id': 1, 'is_bot': True, 'first_name': 'Bot'}, 'text': '...',
+            },
+        }}
+
+
+def journey(user: VirtualUser, rng: random.Random, graph, categories) -> list[dict]:
+    """
+    [RU]
+    Формирует последовательность обновлений одного пользователя.
+
+    [EN]
+    Builds the update sequence of one user.
+    """
+    from data.references import ReferenceCallback
+    from handlers.interview.questions import AnswerCallback
+
+    updates = [user.message(text='/start'), user.callback(user.user['first_name'])]
+
+    category = rng.choice(categories)
+    updates += [
+        user.callback('📂 Примеры работ'),
+        user.callback(ReferenceCallback(category=category.id).pack()),
+        user.callback('Назад'),
+        user.callback('🏠 Вернуться в главное меню'),
+    ]
+
+    updates.append(user.callback('💻 Заказать сайт'))
+    index = 1
+    while question := graph.get(index):
+        if question.answers:
+            answer = rng.choice(question.answers)
+            updates.append(user.callback(AnswerCallback(answer_id=answer.id).pack()))
+            index = answer.next if answer.next is not None else index + 1
+        else:
+            updates.append(user.message(text='Сайт для небольшой студии'))
+            index += 1
+    updates.append(user.message(contact={
+        'phone_number': f'7900{user.user["id"]:07d}', 'first_name': user.user['first_name'], 'user_id': user.user['id'],
+    }))
+
+    # Повторный /start уже известного пользователя / Repeated /start of a known user
+    updates.append(user.message(text='/start'))
+    return updates
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+async def seed():
+    from data import database
+
+    await database.create_database()
+    async with database.async_session() as session:
+        for number, (content, answers) in enumerate(QUESTIONS, start=1):
+            question = database.Question(id=number, content=content)
+            question.answers = [database.Answer(content=answer) for answer in answers]
+            session.add(question)
+        session.add(database.Group(id=MANAGERS_GROUP_ID, title='Managers', is_mailing=True))
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import main
+    from aiogram import BaseMiddleware
+    from aiogram.client.telegram import TelegramAPIServer
+    from data import database
+    from data.references import categories
+    from handlers.interview.questions import load_questions
+
+    class HandlerProbe(BaseMiddleware):
+        async def __call__(self, handler, event, data):
+            handled = _handled.get()
+            if handled is not None:
+                handled.append(data['handler'].callback.__qualname__)
+            return await handler(event, data)
+
+    api = FakeTelegramAPI(latency=args.api_latency / 1000)
+    await api.start()
+
+    await seed()
+    main.setup_dispatcher()
+    for observer in (main.dp.message, main.dp.callback_query):
+        observer.middleware(HandlerProbe())
+    bot = main.create_bot()
+    bot.session.api = TelegramAPIServer.from_base(api.url)
+    await main.dp.emit_startup(bot=bot)
+
+    rng = random.Random(args.seed)
+    graph = await load_questions()
+    category_list = list(categories)
+    users = [VirtualUser(100_000 + number) for number in range(args.users)]
+    journeys = [journey(user, rng, graph, category_list) for user in users]
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: Counter[str] = Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def replay(updates: list[dict]):
+        async with semaphore:
+            for update in updates:
+                handled = []
+                _handled.set(handled)
+                start = time.perf_counter()
+                try:
+                    await main.dp.feed_raw_update(bot, update)
+                except Exception:
+                    errors[handled[0] if handled else 'unhandled'] += 1
+                samples[handled[0] if handled else 'unhandled'].append(time.perf_counter() - start)
+                if args.think:
+                    await asyncio.sleep(args.think / 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(replay(updates) for updates in journeys))
+    elapsed = time.perf_counter() - start
+
+    await main.dp.emit_shutdown(bot=bot)
+    await main.dp.storage.close()
+    await bot.session.close()
+    await database.engine.dispose()
+    await api.stop()
+
+    def summary(values: list[float]) -> dict:
+        return {
+            'count': len(values),
+            'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+            'max_ms': round(max(values) * 1000, 2),
+            'updates_per_s': round(len(values) / elapsed, 1),
+        }
+
+    every = [value for values in samples.values() for value in values]
+    return {
+        'settings': vars(args),
+        'elapsed_s': round(elapsed, 3),
+        'total': summary(every),
+        'handlers': {name: summary(values) for name, values in sorted(samples.items())},
+        'errors': dict(errors),
+        'api_calls': dict(api.calls.most_common()),
+    }
+
+
+def report(result: dict):
+    header = f"{'handler':<28}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'upd/s':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, row in (*result['handlers'].items(), ('TOTAL', result['total'])):
+        print(f"{name:<28}{row['count']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+              f"{row['p99_ms']:>10}{row['max_ms']:>10}{row['updates_per_s']:>10}")
+    print(f"\nВремя прогона: {result['elapsed_s']} с")
+    if result['errors']:
+        print(f"Ошибки: {result['errors']}")
+    print(f"Вызовы API: {result['api_calls']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Нагрузочное тестирование бота / Bot load test')
+    parser.add_argument('--users', type=int, default=100, help='количество виртуальных пользователей')
+    parser.add_argument('--concurrency', type=int, default=25, help='одновременно активных пользователей')
+    parser.add_argument('--seed', type=int, default=1, help='seed генератора сценариев')
+    parser.add_argument('--storage', choices=('sqlite', 'memory'), default='sqlite', help='хранилище FSM')
+    parser.add_argument('--api-latency', type=float, default=0, help='задержка ответа API, мс')
+    parser.add_argument('--think', type=float, default=0, help='пауза между действиями пользователя, мс')
+    parser.add_argument('--json', type=Path, help='сохранить результат в JSON')
+    args = parser.parse_args()
+    if args.json:
+        args.json = args.json.resolve()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Окружение задается до импорта модулей бота, читающих Config
+        # The environment is set before importing bot modules that read Config
+        os.environ.update({
+            'BOT_TOKEN': '123456:LOADTEST',
+            'DB_PATH': str(Path(directory, 'db.db')),
+            'FSM_STORAGE': args.storage,
+            'METRICS_PORT': '',
+            'DEBUG': '0',
+        })
+        os.chdir(ROOT)
+        sys.path.insert(0, str(ROOT))
+
+        result = asyncio.run(run(args))
+
+    report(result)
+    if args.json:
+        args.json.write_text(json.dumps(result, ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+[RU]
+Микро-бенчмарки движка анкеты и функций работы с базой данных.
+
+Создает временную базу данных SQLite с тысячами вопросов, ответов
+и пользователей и измеряет время отдельных операций. Результаты
+сравниваются с базовыми значениями из benchmarks/baseline.json:
+если медиана операции хуже базовой больше чем на порог, скрипт
+завершается с кодом 1.
+
+Базовые значения зависят от машины, поэтому после изменения
+окружения их нужно обновить ключом --save.
+
+Запуск из корня проекта:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --threshold 0.5 --only get_user
+    python benchmarks/micro.py --save
+
+[EN]
+Micro-benchmarks of the interview engine and database helpers.
+
+Creates a temporary SQLite database with thousands of questions, answers
+and users and measures the time of individual operations. Results are
+compared to the baseline values from benchmarks/baseline.json: if an
+operation median is worse than the baseline by more than the threshold,
+the script exits with code 1.
+
+Baseline values depend on the machine, so they must be refreshed with
+--save after the environment changes.
+
+Run from the project root:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --threshold 0.5 --only get_user
+    python benchmarks/micro.py --save
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+QUESTIONS = 2000
+ANSWERS_PER_QUESTION = 4
+USERS = 5000
+LEAD_ANSWERS = 10
+
+Benchmark = Callable[[random.Random], Awaitable[None]]
+BENCHMARKS: dict[str, tuple[Benchmark, int]] = {}
+
+
+def benchmark(name: str, number: int = 200):
+    """
+    [RU]
+    Регистрирует бенчмарк.
+
+    Args:
+        name (str): Имя бенчмарка
+        number (int): Количество операций в одном раунде
+
+    [EN]
+    Registers a benchmark.
+
+    Args:
+        name (str): Benchmark name
+        number (int): Number of operations per round
+    """
+    def decorator(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (function, number)
+        return function
+    return decorator
+
+
+@benchmark('get_question_by_id')
+async def bench_get_question_by_id(rng: random.Random):
+    from data import database
+
+    async with database.async_session() as session:
+        await database.get_question_by_id(session, rng.randint(1, QUESTIONS))
+
+
+@benchmark('get_all_questions_with_answers', number=3)
+async def bench_get_all_questions_with_answers(rng: random.Random):
+    from data import database
+
+    async with database.async_session() as session:
+        await database.get_all_questions_with_answers(session)
+
+
+@benchmark('get_user')
+async def bench_get_user(rng: random.Random):
+    from data import database
+
+    user_id = rng.randint(1, USERS)
+    database.user_cache.invalidate(user_id)
+    await database.get_user(user_id)
+
+
+@benchmark('get_user_cached', number=10_000)
+async def bench_get_user_cached(rng: random.Random):
+    from data import database
+
+    await database.get_user(rng.randint(1, 100))
+
+
+@benchmark('load_questions', number=10_000)
+async def bench_load_questions(rng: random.Random):
+    from handlers.interview.questions import load_questions
+
+    await load_questions()
+
+
+@benchmark('load_questions_cold', number=3)
+async def bench_load_questions_cold(rng: random.Random):
+    from handlers.interview.questions import load_questions, question_cache
+
+    question_cache.invalidate()
+    await load_questions()
+
+
+_questions = []
+
+
+@benchmark('compile_question', number=2000)
+async def bench_compile_question(rng: random.Random):
+    from handlers.interview.questions import compile_question
+
+    compile_question(rng.choice(_questions))
+
+
+@benchmark('build_lead_text', number=10_000)
+async def bench_build_lead_text(rng: random.Random):
+    from handlers.interview.phone import build_lead_text
+
+    build_lead_text('username', 'Имя', {
+        f'Вопрос анкеты номер {number}?': f'Вариант ответа {number}' for number in range(LEAD_ANSWERS)
+    })
+
+
+async def seed():
+    from sqlalchemy import insert
+    from data import database
+
+    await database.create_database()
+    async with database.async_session() as session:
+        await session.execute(insert(database.Question), [
+            {'id': number, 'content': f'Вопрос анкеты номер {number}?'} for number in range(1, QUESTIONS + 1)
+        ])
+        await session.execute(insert(database.Answer), [
+            {'question_id': number, 'content': f'Вариант ответа {answer}', 'next': None}
+            for number in range(1, QUESTIONS + 1) for answer in range(ANSWERS_PER_QUESTION)
+        ])
+        await session.execute(insert(database.User), [
+            {'id': number, 'username': f'user{number}', 'name': f'Пользователь {number}'}
+            for number in range(1, USERS + 1)
+        ])
+        await session.commit()
+
+        _questions.extend(await database.get_all_questions_with_answers(session))
+
+
+async def measure(function: Benchmark, number: int, rounds: int, rng: random.Random) -> dict:
+    for _ in range(max(1, number // 10)):
+        await function(rng)
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            await function(rng)
+        timings.append((time.perf_counter() - start) / number)
+
+    median = statistics.median(timings)
+    return {
+        'min_us': round(min(timings) * 1e6, 2),
+        'median_us': round(median * 1e6, 2),
+        'mean_us': round(statistics.mean(timings) * 1e6, 2),
+        'stdev_us': round(statistics.stdev(timings) * 1e6, 2) if len(timings) > 1 else 0.0,
+        'ops_per_s': round(1 / median, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from data import database
+
+    await seed()
+    rng = random.Random(args.seed)
+    results = {}
+    for name, (function, number) in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = await measure(function, number, args.rounds, rng)
+        print(f"{name:<32}{results[name]['median_us']:>12} мкс{results[name]['ops_per_s']:>14} оп/с")
+    await database.engine.dispose()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    [RU]
+    Сравнивает результаты с базовыми значениями.
+
+    Returns:
+        list[str]: Описания регрессий
+
+    [EN]
+    Compares results with the baseline values.
+
+    Returns:
+        list[str]: Regression descriptions
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = result['median_us'] / base['median_us']
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {result['median_us']} мкс против {base['median_us']} мкс (x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микро-бенчмарки / Micro-benchmarks')
+    parser.add_argument('--rounds', type=int, default=7, help='количество раундов измерения')
+    parser.add_argument('--seed', type=int, default=1, help='seed генератора')
+    parser.add_argument('--threshold', type=float, default=0.3, help='допустимое ухудшение медианы (0.3 = 30%%)')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='запустить только указанные бенчмарки')
+    parser.add_argument('--save', action='store_true', help='сохранить результаты как базовые')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Окружение задается до импорта модулей бота, читающих Config
+        # The environment is set before importing bot modules that read Config
+        os.environ.update({
+            'BOT_TOKEN': '123456:BENCHMARK',
+            'DB_PATH': str(Path(directory, 'db.db')),
+            'DEBUG': '0',
+        })
+        os.chdir(ROOT)
+        sys.path.insert(0, str(ROOT))
+
+        results = asyncio.run(run(args))
+
+    if args.save:
+        baseline = json.loads(BASELINE.read_text(encoding='utf-8')) if BASELINE.exists() else {}
+        baseline.update(results)
+        BASELINE.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        print(f"Базовые значения сохранены в {BASELINE.relative_to(ROOT)}")
+        return
+
+    if not BASELINE.exists():
+        print("Базовые значения не найдены, запустите с ключом --save")
+        return
+
+    regressions = compare(results, json.loads(BASELINE.read_text(encoding='utf-8')), args.threshold)
+    if regressions:
+        print(f"\nРегрессии (порог {args.threshold:.0%}):")
+        print('\n'.join(regressions))
+        sys.exit(1)
+    print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,19 +12,128 @@ Defines data models, provides functions for database operations
 and connection management. Uses SQLAlchemy for async work with SQLite.
 """
 
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 import logging
-from typing import Optional, Union
+from typing import AsyncIterator, Optional, Union
 
-from icecream import ic
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from utils.debug import trace
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, relationship, DeclarativeBase
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Text, event
 from contextlib import asynccontextmanager
 
-DATABASE_URL = f"sqlite+aiosqlite:///{Path('data', 'db.db')}"
-engine = create_async_engine(DATABASE_URL, echo=True)
+from loader import Config
+
+DATABASE_URL = f"sqlite+aiosqlite:///{Config().get_db_path()}"
+
+
+@dataclass(frozen=True, slots=True)
+class EngineProfile:
+    """
+    [RU]
+    Профиль настроек движка SQLite.
+
+    Attributes:
+        echo (bool): Выводить ли SQL-запросы в лог
+        journal_mode (str): Режим журнала (WAL позволяет читать во время записи)
+        synchronous (str): Режим синхронизации с диском
+        mmap_size (int): Размер отображаемой в память области, байт
+        cache_size (int): Размер кэша страниц (отрицательное значение - в КиБ)
+        busy_timeout (int): Время ожидания блокировки, мс
+        pool_size (int): Размер пула соединений
+        max_overflow (int): Дополнительные соединения сверх пула
+
+    [EN]
+    SQLite engine settings profile.
+
+    Attributes:
+        echo (bool): Whether to log SQL statements
+        journal_mode (str): Journal mode (WAL allows reads during writes)
+        synchronous (str): Disk synchronization mode
+        mmap_size (int): Memory-mapped area size, bytes
+        cache_size (int): Page cache size (negative value - in KiB)
+        busy_timeout (int): Lock wait timeout, ms
+        pool_size (int): Connection pool size
+        max_overflow (int): Extra connections above the pool
+    """
+    echo: bool = False
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size: int = -64 * 1024
+    busy_timeout: int = 5000
+    pool_size: int = 5
+    max_overflow: int = 5
+
+    def pragmas(self) -> dict:
+        """
+        [RU]
+        Возвращает PRAGMA-настройки, применяемые к каждому соединению.
+
+        [EN]
+        Returns PRAGMA settings applied to every connection.
+        """
+        return {
+            'journal_mode': self.journal_mode,
+            'synchronous': self.synchronous,
+            'mmap_size': self.mmap_size,
+            'cache_size': self.cache_size,
+            'busy_timeout': self.busy_timeout,
+        }
+
+
+def create_engine(url: str, profile: EngineProfile) -> AsyncEngine:
+    """
+    [RU]
+    Создает асинхронный движок SQLite с заданным профилем.
+
+    PRAGMA-настройки применяются при открытии каждого соединения пула.
+    Вывод SQL-запросов включается через логгер sqlalchemy.engine.
+
+    Args:
+        url (str): URL базы данных
+        profile (EngineProfile): Профиль настроек
+
+    Returns:
+        AsyncEngine: Асинхронный движок SQLAlchemy
+
+    [EN]
+    Creates an async SQLite engine with the given profile.
+
+    PRAGMA settings are applied when each pool connection is opened.
+    SQL statement output is enabled through the sqlalchemy.engine logger.
+
+    Args:
+        url (str): Database URL
+        profile (EngineProfile): Settings profile
+
+    Returns:
+        AsyncEngine: SQLAlchemy async engine
+    """
+    async_engine = create_async_engine(
+        url,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+    )
+    if profile.echo:
+        # Через общие обработчики логов, без отдельного вывода echo в stdout
+        # Through the shared log handlers, without echo's separate stdout output
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
+
+    @event.listens_for(async_engine.sync_engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in profile.pragmas().items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    return async_engine
+
+
+engine = create_engine(DATABASE_URL, EngineProfile(**Config().get_db_profile()))
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 class Base(DeclarativeBase):
@@ -176,6 +285,340 @@ class Answer(Base):
     question = relationship('Question', back_populates='answers')
 
 
+class MediaFile(Base):
+    """
+    [RU]
+    Модель для хранения file_id загруженных в Telegram файлов.
+
+    Запись привязана к пути файла и хешу его содержимого, поэтому
+    после изменения файла на диске старый file_id больше не используется.
+
+    Attributes:
+        path (str): Относительный путь к файлу
+        content_hash (str): SHA-256 содержимого файла
+        file_id (str): Идентификатор файла на серверах Telegram
+
+    [EN]
+    Model for storing file_id of files uploaded to Telegram.
+
+    The record is bound to the file path and its content hash, so
+    once the file changes on disk the old file_id is no longer used.
+
+    Attributes:
+        path (str): Relative file path
+        content_hash (str): SHA-256 of file content
+        file_id (str): File identifier on Telegram servers
+    """
+    __tablename__ = 'media_files'
+
+    path = Column(String, primary_key=True)
+    content_hash = Column(String, primary_key=True)
+    file_id = Column(String, nullable=False)
+
+
+class Outbox(Base):
+    """
+    [RU]
+    Модель очереди исходящих сообщений.
+
+    Сообщение остается в очереди до успешной доставки или исчерпания
+    попыток, поэтому оно не теряется при перезапуске бота.
+
+    Attributes:
+        id (int): Уникальный идентификатор сообщения
+        chat_id (int): ID чата получателя
+        text (str): Текст сообщения
+        status (str): Статус: pending, sent или failed
+        attempts (int): Количество попыток отправки
+        next_attempt_at (datetime): Время следующей попытки
+        last_error (str): Текст последней ошибки
+
+    [EN]
+    Outgoing message queue model.
+
+    A message stays in the queue until delivered or out of attempts,
+    so it is not lost when the bot restarts.
+
+    Attributes:
+        id (int): Unique message identifier
+        chat_id (int): Recipient chat ID
+        text (str): Message text
+        status (str): Status: pending, sent or failed
+        attempts (int): Number of sending attempts
+        next_attempt_at (datetime): Next attempt time
+        last_error (str): Last error text
+    """
+    __tablename__ = 'outbox'
+
+    id = Column(Integer, primary_key=True)
+    chat_id = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    status = Column(String, default='pending', nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text)
+
+
+class Lead(Base):
+    """
+    [RU]
+    Модель завершенной анкеты (заявки) пользователя.
+
+    Attributes:
+        id (int): Уникальный идентификатор заявки
+        user_id (int): Telegram ID пользователя
+        username (str): Имя пользователя в Telegram
+        name (str): Имя пользователя
+        phone (str): Номер телефона
+        answers (relationship): Ответы на вопросы анкеты
+
+    [EN]
+    Completed questionnaire (application) model.
+
+    Attributes:
+        id (int): Unique application identifier
+        user_id (int): Telegram user ID
+        username (str): Telegram username
+        name (str): User name
+        phone (str): Phone number
+        answers (relationship): Questionnaire answers
+    """
+    __tablename__ = 'leads'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    username = Column(String)
+    name = Column(String)
+    phone = Column(String)
+    answers = relationship('LeadAnswer', back_populates='lead', cascade='all, delete-orphan',
+                           order_by='LeadAnswer.position')
+
+
+class LeadAnswer(Base):
+    """
+    [RU]
+    Модель ответа на вопрос в заявке.
+
+    Текст вопроса и ответа сохраняется как есть, поэтому история
+    не меняется при редактировании анкеты.
+
+    Attributes:
+        id (int): Уникальный идентификатор ответа
+        lead_id (int): ID заявки
+        position (int): Порядковый номер ответа в анкете
+        question (str): Текст вопроса
+        answer (str): Текст ответа
+
+    [EN]
+    Application answer model.
+
+    Question and answer text is stored as is, so the history
+    does not change when the questionnaire is edited.
+
+    Attributes:
+        id (int): Unique answer identifier
+        lead_id (int): Application ID
+        position (int): Answer position in the questionnaire
+        question (str): Question text
+        answer (str): Answer text
+    """
+    __tablename__ = 'lead_answers'
+
+    id = Column(Integer, primary_key=True)
+    lead_id = Column(Integer, ForeignKey('leads.id'), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    question = Column(Text, nullable=False)
+    answer = Column(Text)
+    lead = relationship('Lead', back_populates='answers')
+
+
+class Broadcast(Base):
+    """
+    [RU]
+    Модель рассылки сообщения пользователям или группам.
+
+    Получатели обходятся по возрастанию ID, поэтому прогресс хранится
+    как ID последнего обработанного получателя, и после перезапуска
+    рассылка продолжается с этого места.
+
+    Attributes:
+        id (int): Уникальный идентификатор рассылки
+        audience (str): Получатели: users или groups
+        text (str): Текст сообщения
+        status (str): Статус: pending, running, done или cancelled
+        checkpoint (int): ID последнего обработанного получателя
+        total (int): Количество получателей на момент запуска
+        sent (int): Доставлено сообщений
+        failed (int): Не доставлено сообщений
+        blocked (int): Получателей, заблокировавших бота
+        chat_id (int): ID чата с сообщением о ходе рассылки
+        message_id (int): ID сообщения о ходе рассылки
+        finished_at (datetime): Время завершения
+
+    [EN]
+    Model of a message broadcast to users or groups.
+
+    Recipients are traversed in ascending ID order, so progress is stored
+    as the ID of the last processed recipient, and after a restart the
+    broadcast continues from that point.
+
+    Attributes:
+        id (int): Unique broadcast identifier
+        audience (str): Recipients: users or groups
+        text (str): Message text
+        status (str): Status: pending, running, done or cancelled
+        checkpoint (int): ID of the last processed recipient
+        total (int): Number of recipients at start
+        sent (int): Delivered messages
+        failed (int): Undelivered messages
+        blocked (int): Recipients who blocked the bot
+        chat_id (int): ID of the chat with the progress message
+        message_id (int): Progress message ID
+        finished_at (datetime): Completion time
+    """
+    __tablename__ = 'broadcasts'
+
+    id = Column(Integer, primary_key=True)
+    audience = Column(String, nullable=False)
+    text = Column(Text, nullable=False)
+    status = Column(String, default='pending', nullable=False, index=True)
+    checkpoint = Column(Integer)
+    total = Column(Integer, default=0, nullable=False)
+    sent = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    blocked = Column(Integer, default=0, nullable=False)
+    chat_id = Column(Integer)
+    message_id = Column(Integer)
+    finished_at = Column(DateTime)
+
+
+class FSMRecord(Base):
+    """
+    [RU]
+    Модель для хранения состояний FSM пользователей.
+
+    Attributes:
+        key (str): Ключ хранилища FSM (чат и пользователь)
+        state (str): Текущее состояние
+        data (str): Данные состояния в формате JSON
+
+    [EN]
+    Model for storing users' FSM states.
+
+    Attributes:
+        key (str): FSM storage key (chat and user)
+        state (str): Current state
+        data (str): State data in JSON format
+    """
+    __tablename__ = 'fsm_states'
+
+    key = Column(String, primary_key=True)
+    state = Column(String)
+    data = Column(Text, nullable=False, default='{}')
+
+
+class UserCache:
+    """
+    [RU]
+    LRU-кэш пользователей с ограниченным временем жизни записей.
+
+    Хранит отсоединенные от сессии копии объектов User, поэтому
+    повторный /start известного пользователя не обращается к базе данных.
+
+    [EN]
+    LRU user cache with limited entry lifetime.
+
+    Keeps copies of User objects detached from any session, so a repeated
+    /start of a known user does not touch the database.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        [RU]
+        Args:
+            maxsize (int): Максимальное количество пользователей в кэше
+            ttl (float): Время жизни записи в секундах
+
+        [EN]
+        Args:
+            maxsize (int): Maximum number of cached users
+            ttl (float): Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._users: OrderedDict[int, tuple[float, User]] = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[User]:
+        """
+        [RU]
+        Возвращает пользователя из кэша.
+
+        Args:
+            user_id (int): Telegram ID пользователя
+
+        Returns:
+            Optional[User]: Пользователь или None, если его нет в кэше или запись устарела
+
+        [EN]
+        Returns a user from the cache.
+
+        Args:
+            user_id (int): Telegram user ID
+
+        Returns:
+            Optional[User]: User or None if not cached or the entry is outdated
+        """
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._users[user_id]
+            return None
+        self._users.move_to_end(user_id)
+        return entry[1]
+
+    def put(self, user: User):
+        """
+        [RU]
+        Сохраняет копию пользователя в кэше.
+
+        Args:
+            user (User): Пользователь
+
+        [EN]
+        Stores a copy of the user in the cache.
+
+        Args:
+            user (User): User
+        """
+        if self.maxsize <= 0:
+            return
+        copy = User(id=user.id, username=user.username, name=user.name)
+        self._users[user.id] = (time.monotonic() + self.ttl, copy)
+        self._users.move_to_end(user.id)
+        while len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        """
+        [RU]
+        Удаляет пользователя из кэша.
+
+        Args:
+            user_id (int): Telegram ID пользователя
+
+        [EN]
+        Removes a user from the cache.
+
+        Args:
+            user_id (int): Telegram user ID
+        """
+        self._users.pop(user_id, None)
+
+
+user_cache = UserCache(**Config().get_users_cache_settings())
+
+
 @asynccontextmanager
 async def get_db():
     """
@@ -201,6 +644,54 @@ async def get_db():
             raise
 
 
+class LazySession:
+    """
+    [RU]
+    Ленивая обертка над сессией базы данных.
+
+    Сессия создается только при первом обращении к любому её атрибуту.
+    При выходе из контекста выполняется commit (или rollback при ошибке)
+    только если сессия была открыта.
+
+    [EN]
+    Lazy wrapper around a database session.
+
+    The session is created only on first access to any of its attributes.
+    On context exit commit (or rollback on error) is performed only
+    if the session was opened.
+    """
+
+    def __init__(self, factory=async_session):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+        self.is_opened = False
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+            self.is_opened = True
+        return getattr(self._session, name)
+
+    async def __aenter__(self) -> 'LazySession':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        session, self._session = self._session, None
+        if session is None:
+            return
+
+        async with session:
+            try:
+                if exc is not None:
+                    raise exc
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logging.error(f"Ошибка при работе с базой данных: {e}")
+                if exc is None:
+                    raise
+
+
 async def create_database() -> bool:
     """
     [RU]
@@ -304,13 +795,17 @@ async def get_all_questions_with_answers(session: AsyncSession):
     return result.scalars().all()
 
 
-async def get_user(id: int) -> Optional[User]:
+async def get_user(id: int, session: Optional[AsyncSession] = None) -> Optional[User]:
     """
     [RU]
     Получает информацию о пользователе по его ID.
 
+    Сначала ищет пользователя в кэше. При промахе использует переданную
+    сессию запроса, а если она не передана - открывает новую.
+
     Args:
         id (int): Telegram ID пользователя
+        session (Optional[AsyncSession]): Сессия базы данных текущего запроса
 
     Returns:
         Optional[User]: Объект пользователя или None если не найден
@@ -318,23 +813,38 @@ async def get_user(id: int) -> Optional[User]:
     [EN]
     Gets user information by ID.
 
+    Looks the user up in the cache first. On a miss uses the given
+    request session, or opens a new one if none is given.
+
     Args:
         id (int): Telegram user ID
+        session (Optional[AsyncSession]): Current request database session
 
     Returns:
         Optional[User]: User object or None if not found
     """
-    async with get_db() as session:
-        try:
-            from sqlalchemy import select
+    user = user_cache.get(id)
+    if user is not None:
+        return user
 
-            query = select(User).where(User.id == id)
-            result = await session.execute(query)
-            return result.scalar_one_or_none()
+    if session is None:
+        async with get_db() as session:
+            return await get_user(id, session)
 
-        except Exception as e:
-            logging.error(f"Ошибка при проверке пользователя: {e}")
-            return False
+    try:
+        from sqlalchemy import select
+
+        query = select(User).where(User.id == id)
+        result = await session.execute(query)
+        user = result.scalar_one_or_none()
+
+    except Exception as e:
+        logging.error(f"Ошибка при проверке пользователя: {e}")
+        return False
+
+    if user is not None:
+        user_cache.put(user)
+    return user
 
 async def get_admins_ids() -> Optional[Admin]:
     """
@@ -356,8 +866,488 @@ async def get_admins_ids() -> Optional[Admin]:
 
             query = select(Admin.id)
             result = await session.execute(query)
-            return ic(result.scalars().all())
+            return trace(result.scalars().all())
 
         except Exception as e:
             logging.error(f"Ошибка при проверке пользователя: {e}")
-            return None
\ No newline at end of file
+            return None
+
+async def get_media_file_ids(session: AsyncSession, keys: list[tuple[str, str]]) -> dict[tuple[str, str], str]:
+    """
+    [RU]
+    Получает сохраненные file_id для набора файлов.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        keys (list[tuple[str, str]]): Пары (путь, хеш содержимого)
+
+    Returns:
+        dict[tuple[str, str], str]: Найденные file_id по ключу (путь, хеш)
+
+    [EN]
+    Gets saved file_id values for a set of files.
+
+    Args:
+        session (AsyncSession): Database session
+        keys (list[tuple[str, str]]): (path, content hash) pairs
+
+    Returns:
+        dict[tuple[str, str], str]: Found file_id values keyed by (path, hash)
+    """
+    from sqlalchemy import select, tuple_
+
+    if not keys:
+        return {}
+
+    query = select(MediaFile).where(tuple_(MediaFile.path, MediaFile.content_hash).in_(keys))
+    result = await session.execute(query)
+    return {(media.path, media.content_hash): media.file_id for media in result.scalars()}
+
+
+async def save_media_file_id(session: AsyncSession, path: str, content_hash: str, file_id: str):
+    """
+    [RU]
+    Сохраняет file_id файла и удаляет записи для устаревших версий файла.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        path (str): Относительный путь к файлу
+        content_hash (str): SHA-256 содержимого файла
+        file_id (str): Идентификатор файла на серверах Telegram
+
+    [EN]
+    Saves file_id of a file and removes records of outdated file versions.
+
+    Args:
+        session (AsyncSession): Database session
+        path (str): Relative file path
+        content_hash (str): SHA-256 of file content
+        file_id (str): File identifier on Telegram servers
+    """
+    from sqlalchemy import delete
+
+    await session.execute(
+        delete(MediaFile).where(MediaFile.path == path, MediaFile.content_hash != content_hash)
+    )
+    await session.merge(MediaFile(path=path, content_hash=content_hash, file_id=file_id))
+
+
+async def get_mailing_groups_ids(session: AsyncSession) -> list[int]:
+    """
+    [RU]
+    Получает ID групп, для которых включена рассылка.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+
+    Returns:
+        list[int]: Список ID групп
+
+    [EN]
+    Gets IDs of groups with mailing enabled.
+
+    Args:
+        session (AsyncSession): Database session
+
+    Returns:
+        list[int]: List of group IDs
+    """
+    from sqlalchemy import select
+
+    query = select(Group.id).where(Group.is_mailing.is_not(False))
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+
+async def enqueue_messages(session: AsyncSession, chat_ids: list[int], text: str):
+    """
+    [RU]
+    Добавляет сообщение для нескольких чатов в очередь исходящих сообщений.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        chat_ids (list[int]): ID чатов получателей
+        text (str): Текст сообщения
+
+    [EN]
+    Adds a message for several chats to the outgoing message queue.
+
+    Args:
+        session (AsyncSession): Database session
+        chat_ids (list[int]): Recipient chat IDs
+        text (str): Message text
+    """
+    session.add_all([Outbox(chat_id=chat_id, text=text) for chat_id in chat_ids])
+
+
+async def get_due_messages(session: AsyncSession, limit: int, exclude: set[int]) -> list[Outbox]:
+    """
+    [RU]
+    Получает сообщения очереди, время отправки которых наступило.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        limit (int): Максимальное количество сообщений
+        exclude (set[int]): ID сообщений, которые уже обрабатываются
+
+    Returns:
+        list[Outbox]: Список сообщений
+
+    [EN]
+    Gets queued messages that are due for sending.
+
+    Args:
+        session (AsyncSession): Database session
+        limit (int): Maximum number of messages
+        exclude (set[int]): IDs of messages already being processed
+
+    Returns:
+        list[Outbox]: List of messages
+    """
+    from sqlalchemy import select
+
+    query = select(Outbox).where(
+        Outbox.status == 'pending',
+        Outbox.next_attempt_at <= datetime.utcnow(),
+        Outbox.id.not_in(exclude),
+    ).order_by(Outbox.id).limit(limit)
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+
+async def update_message(session: AsyncSession, message_id: int, **values):
+    """
+    [RU]
+    Обновляет сообщение очереди исходящих сообщений.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        message_id (int): ID сообщения
+        **values: Новые значения полей
+
+    [EN]
+    Updates a message of the outgoing message queue.
+
+    Args:
+        session (AsyncSession): Database session
+        message_id (int): Message ID
+        **values: New field values
+    """
+    from sqlalchemy import update
+
+    await session.execute(update(Outbox).where(Outbox.id == message_id).values(**values))
+
+
+async def upsert(session: AsyncSession, model: type[Base], rows: list[dict], update: tuple[str, ...]):
+    """
+    [RU]
+    Вставляет записи одним запросом INSERT ... ON CONFLICT DO UPDATE.
+
+    Существующие записи с тем же первичным ключом не вызывают ошибку,
+    а обновляют перечисленные поля. Транзакцию не фиксирует.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        model (type[Base]): Модель таблицы
+        rows (list[dict]): Значения полей записей
+        update (tuple[str, ...]): Поля, обновляемые при конфликте
+
+    [EN]
+    Inserts records with a single INSERT ... ON CONFLICT DO UPDATE statement.
+
+    Existing records with the same primary key do not raise an error
+    but have the listed fields updated. Does not commit the transaction.
+
+    Args:
+        session (AsyncSession): Database session
+        model (type[Base]): Table model
+        rows (list[dict]): Record field values
+        update (tuple[str, ...]): Fields updated on conflict
+    """
+    from sqlalchemy.dialects.sqlite import insert
+
+    if not rows:
+        return
+
+    query = insert(model)
+    query = query.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key],
+        set_={name: query.excluded[name] for name in update},
+    )
+    await session.execute(query, rows)
+
+
+async def upsert_user(session: AsyncSession, id: int, username: Optional[str], name: Optional[str]):
+    """
+    [RU]
+    Добавляет пользователя или обновляет его username и имя.
+
+    [EN]
+    Adds a user or updates their username and name.
+    """
+    await upsert(session, User, [{'id': id, 'username': username, 'name': name}], ('username', 'name'))
+
+
+async def upsert_admin(session: AsyncSession, id: int, username: Optional[str]):
+    """
+    [RU]
+    Добавляет администратора или обновляет его username.
+
+    [EN]
+    Adds an admin or updates their username.
+    """
+    await upsert(session, Admin, [{'id': id, 'username': username}], ('username',))
+
+
+async def upsert_group(session: AsyncSession, id: int, title: Optional[str]):
+    """
+    [RU]
+    Добавляет группу или обновляет ее название. Флаг рассылки
+    существующей группы не меняется.
+
+    [EN]
+    Adds a group or updates its title. The mailing flag of an
+    existing group is left unchanged.
+    """
+    await upsert(session, Group, [{'id': id, 'title': title}], ('title',))
+
+
+async def save_leads(session: AsyncSession, leads: list[Lead]):
+    """
+    [RU]
+    Добавляет заявки вместе с ответами в сессию. Записи вставляются
+    пакетно при фиксации транзакции.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        leads (list[Lead]): Заявки
+
+    [EN]
+    Adds applications with their answers to the session. Records are
+    inserted in batches when the transaction is committed.
+
+    Args:
+        session (AsyncSession): Database session
+        leads (list[Lead]): Applications
+    """
+    session.add_all(leads)
+
+
+async def stream_users(session: AsyncSession, chunk_size: int) -> AsyncIterator[list[User]]:
+    """
+    [RU]
+    Построчно читает пользователей серверным курсором и отдает их
+    порциями фиксированного размера. В памяти одновременно находится
+    только одна порция.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        chunk_size (int): Размер порции
+
+    Yields:
+        list[User]: Порция пользователей
+
+    [EN]
+    Reads users row by row with a server-side cursor and yields them
+    in fixed-size chunks. Objects are expunged from the session after
+    a chunk is processed, so only one chunk is held in memory at a time.
+
+    Args:
+        session (AsyncSession): Database session
+        chunk_size (int): Chunk size
+
+    Yields:
+        list[User]: Chunk of users
+    """
+    from sqlalchemy import select
+
+    query = select(User).order_by(User.id).execution_options(yield_per=chunk_size)
+    result = await session.stream_scalars(query)
+    async for chunk in result.partitions():
+        yield chunk
+        for record in chunk:
+            session.expunge(record)
+
+
+async def stream_leads(session: AsyncSession, chunk_size: int) -> AsyncIterator[list[Lead]]:
+    """
+    [RU]
+    Построчно читает заявки серверным курсором и отдает их порциями
+    фиксированного размера. Ответы загружаются отдельным запросом
+    для каждой порции.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        chunk_size (int): Размер порции
+
+    Yields:
+        list[Lead]: Порция заявок с ответами
+
+    [EN]
+    Reads applications row by row with a server-side cursor and yields
+    them in fixed-size chunks. Answers are loaded with a separate query
+    for each chunk.
+
+    Args:
+        session (AsyncSession): Database session
+        chunk_size (int): Chunk size
+
+    Yields:
+        list[Lead]: Chunk of applications with answers
+    """
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    query = select(Lead).options(selectinload(Lead.answers)).order_by(Lead.id).execution_options(yield_per=chunk_size)
+    result = await session.stream_scalars(query)
+    async for chunk in result.partitions():
+        yield chunk
+        for record in chunk:
+            session.expunge(record)
+
+
+def _recipients_query(audience: str):
+    from sqlalchemy import select
+
+    if audience == 'groups':
+        return select(Group.id).where(Group.is_mailing.is_not(False))
+    return select(User.id)
+
+
+async def count_recipients(session: AsyncSession, audience: str) -> int:
+    """
+    [RU]
+    Считает получателей рассылки.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        audience (str): Получатели: users или groups
+
+    Returns:
+        int: Количество получателей
+
+    [EN]
+    Counts broadcast recipients.
+
+    Args:
+        session (AsyncSession): Database session
+        audience (str): Recipients: users or groups
+
+    Returns:
+        int: Number of recipients
+    """
+    from sqlalchemy import select
+
+    result = await session.execute(select(func.count()).select_from(_recipients_query(audience).subquery()))
+    return result.scalar_one()
+
+
+async def get_recipients_page(session: AsyncSession, audience: str, after: Optional[int], limit: int) -> list[int]:
+    """
+    [RU]
+    Получает следующую страницу ID получателей рассылки по возрастанию ID.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        audience (str): Получатели: users или groups
+        after (Optional[int]): ID последнего обработанного получателя, None - с начала
+        limit (int): Размер страницы
+
+    Returns:
+        list[int]: ID получателей
+
+    [EN]
+    Gets the next page of broadcast recipient IDs in ascending ID order.
+
+    Args:
+        session (AsyncSession): Database session
+        audience (str): Recipients: users or groups
+        after (Optional[int]): ID of the last processed recipient, None - from the start
+        limit (int): Page size
+
+    Returns:
+        list[int]: Recipient IDs
+    """
+    query = _recipients_query(audience)
+    column = Group.id if audience == 'groups' else User.id
+    if after is not None:
+        query = query.where(column > after)
+    result = await session.execute(query.order_by(column).limit(limit))
+    return list(result.scalars().all())
+
+
+async def disable_mailing(session: AsyncSession, group_ids: list[int]):
+    """
+    [RU]
+    Отключает рассылку для групп, из которых удален бот.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        group_ids (list[int]): ID групп
+
+    [EN]
+    Disables mailing for groups the bot was removed from.
+
+    Args:
+        session (AsyncSession): Database session
+        group_ids (list[int]): Group IDs
+    """
+    from sqlalchemy import update
+
+    if group_ids:
+        await session.execute(update(Group).where(Group.id.in_(group_ids)).values(is_mailing=False))
+
+
+async def get_due_broadcasts(session: AsyncSession, exclude: set[int]) -> list[Broadcast]:
+    """
+    [RU]
+    Получает ожидающие и прерванные рассылки.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        exclude (set[int]): ID рассылок, которые уже выполняются
+
+    Returns:
+        list[Broadcast]: Список рассылок
+
+    [EN]
+    Gets pending and interrupted broadcasts.
+
+    Args:
+        session (AsyncSession): Database session
+        exclude (set[int]): IDs of broadcasts already running
+
+    Returns:
+        list[Broadcast]: List of broadcasts
+    """
+    from sqlalchemy import select
+
+    query = select(Broadcast).where(
+        Broadcast.status.in_(('pending', 'running')),
+        Broadcast.id.not_in(exclude),
+    ).order_by(Broadcast.id)
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+
+async def update_broadcast(session: AsyncSession, broadcast_id: int, **values):
+    """
+    [RU]
+    Обновляет рассылку.
+
+    Args:
+        session (AsyncSession): Сессия базы данных
+        broadcast_id (int): ID рассылки
+        **values: Новые значения полей
+
+    [EN]
+    Updates a broadcast.
+
+    Args:
+        session (AsyncSession): Database session
+        broadcast_id (int): Broadcast ID
+        **values: New field values
+    """
+    from sqlalchemy import update
+
+    await session.execute(update(Broadcast).where(Broadcast.id == broadcast_id).values(**values))
@@ -0,0 +1,157 @@
+"""
+[RU]
+Модуль кэширования медиафайлов, отправляемых в Telegram.
+
+После первой загрузки файла Telegram возвращает его file_id, который
+сохраняется в базе данных вместе с путем и хешем содержимого файла.
+Повторные отправки используют file_id вместо повторной загрузки файла.
+
+[EN]
+Module for caching media files sent to Telegram.
+
+After the first upload Telegram returns the file_id, which is stored
+in the database together with the file path and content hash.
+Subsequent sends reuse the file_id instead of uploading the file again.
+"""
+
+__all__ = ('MediaCache', 'media_cache')
+
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Iterable
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, InputMediaPhoto, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from data.database import get_media_file_ids, save_media_file_id
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaCache:
+    """
+    [RU]
+    Кэш file_id для локальных файлов.
+
+    Хранит хеши файлов (пересчитываются только при изменении размера
+    или времени модификации файла) и найденные file_id в памяти,
+    а в базе данных - постоянную копию file_id.
+
+    [EN]
+    file_id cache for local files.
+
+    Keeps file hashes (recomputed only when file size or modification
+    time changes) and known file_id values in memory, with the database
+    holding the persistent copy of file_id values.
+    """
+
+    def __init__(self):
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+        self._file_ids: dict[tuple[str, str], str] = {}
+
+    async def content_hash(self, path: Path) -> str:
+        """
+        [RU]
+        Возвращает хеш содержимого файла.
+
+        Args:
+            path (Path): Путь к файлу
+
+        Returns:
+            str: SHA-256 содержимого файла
+
+        [EN]
+        Returns file content hash.
+
+        Args:
+            path (Path): File path
+
+        Returns:
+            str: SHA-256 of file content
+        """
+        key = path.as_posix()
+        stat = path.stat()
+        cached = self._hashes.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        content_hash = await asyncio.to_thread(_file_hash, path)
+        self._hashes[key] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash
+
+    async def _keys(self, paths: Iterable[Path]) -> list[tuple[str, str]]:
+        return [(path.as_posix(), await self.content_hash(path)) for path in paths]
+
+    async def send_media_group(self, message: Message, session: AsyncSession, paths: list[Path]) -> list[Message]:
+        """
+        [RU]
+        Отправляет группу фотографий, используя сохраненные file_id.
+
+        Файлы без сохраненного file_id загружаются, а полученные file_id
+        сохраняются в базе данных.
+
+        Args:
+            message (Message): Сообщение, в чат которого отправляются фото
+            session (AsyncSession): Сессия базы данных
+            paths (list[Path]): Пути к файлам
+
+        Returns:
+            list[Message]: Отправленные сообщения
+
+        [EN]
+        Sends a photo group reusing saved file_id values.
+
+        Files without a saved file_id are uploaded, and the returned
+        file_id values are stored in the database.
+
+        Args:
+            message (Message): Message whose chat receives the photos
+            session (AsyncSession): Database session
+            paths (list[Path]): File paths
+
+        Returns:
+            list[Message]: Sent messages
+        """
+        keys = await self._keys(paths)
+
+        missing = [key for key in keys if key not in self._file_ids]
+        if missing:
+            self._file_ids.update(await get_media_file_ids(session, missing))
+
+        media = [
+            InputMediaPhoto(media=self._file_ids.get(key) or FSInputFile(path))
+            for key, path in zip(keys, paths)
+        ]
+        try:
+            messages = await message.answer_media_group(media=media)
+        except TelegramBadRequest as e:
+            if not any(key in self._file_ids for key in keys):
+                raise
+            # file_id мог стать недействительным - загружаем файлы заново
+            logging.warning(f"Не удалось отправить файлы по file_id: {e}")
+            for key in keys:
+                self._file_ids.pop(key, None)
+            messages = await message.answer_media_group(
+                media=[InputMediaPhoto(media=FSInputFile(path)) for path in paths]
+            )
+
+        for key, sent in zip(keys, messages):
+            if key in self._file_ids or not sent.photo:
+                continue
+            file_id = sent.photo[-1].file_id
+            self._file_ids[key] = file_id
+            await save_media_file_id(session, *key, file_id)
+
+        return messages
+
+
+media_cache = MediaCache()
@@ -0,0 +1,162 @@
+"""
+[RU]
+Модуль реестра категорий примеров работ.
+
+Реестр строится один раз при запуске бота по содержимому каталога
+data/image: каждый подкаталог - отдельная категория, файл title.txt
+в нем задает название кнопки, а изображения отправляются пользователю.
+
+[EN]
+Work examples category registry module.
+
+The registry is built once at bot startup from the data/image directory:
+each subdirectory is a category, its title.txt file holds the button
+title, and the images are sent to the user.
+"""
+
+__all__ = ('Category', 'CategoryRegistry', 'ReferenceCallback', 'categories')
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import InlineKeyboardMarkup
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+IMAGE_ROOT = Path('data', 'image')
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg'}
+TITLE_FILE = 'title.txt'
+# Ограничения Telegram для sendMediaGroup / Telegram limits for sendMediaGroup
+MIN_MEDIA_GROUP, MAX_MEDIA_GROUP = 2, 10
+
+
+class ReferenceCallback(CallbackData, prefix='ref'):
+    """
+    [RU]
+    Callback data кнопки категории примеров работ.
+
+    Attributes:
+        category (str): Идентификатор категории (имя каталога)
+
+    [EN]
+    Callback data of a work examples category button.
+
+    Attributes:
+        category (str): Category identifier (directory name)
+    """
+    category: str
+
+
+@dataclass(frozen=True, slots=True)
+class Category:
+    """
+    [RU]
+    Категория примеров работ.
+
+    Attributes:
+        id (str): Идентификатор категории (имя каталога)
+        title (str): Название категории
+        files (tuple[Path, ...]): Проверенные пути к изображениям
+
+    [EN]
+    Work examples category.
+
+    Attributes:
+        id (str): Category identifier (directory name)
+        title (str): Category title
+        files (tuple[Path, ...]): Validated image paths
+    """
+    id: str
+    title: str
+    files: tuple[Path, ...]
+
+
+class CategoryRegistry:
+    """
+    [RU]
+    Реестр категорий примеров работ.
+
+    Обеспечивает поиск категории по идентификатору из callback data
+    и хранит готовую клавиатуру со списком категорий.
+
+    [EN]
+    Work examples category registry.
+
+    Provides category lookup by the callback data identifier
+    and keeps a ready keyboard with the category list.
+    """
+
+    def __init__(self):
+        self._categories: dict[str, Category] = {}
+        self.markup: Optional[InlineKeyboardMarkup] = None
+
+    def load(self, root: Path = IMAGE_ROOT):
+        """
+        [RU]
+        Сканирует каталог с изображениями и строит реестр.
+
+        Args:
+            root (Path): Каталог с подкаталогами категорий
+
+        [EN]
+        Scans the image directory and builds the registry.
+
+        Args:
+            root (Path): Directory with category subdirectories
+        """
+        categories = {}
+        for directory in sorted(path for path in root.iterdir() if path.is_dir()):
+            files = tuple(sorted(
+                path for path in directory.iterdir()
+                if path.suffix.lower() in IMAGE_SUFFIXES and path.is_file() and path.stat().st_size
+            ))
+            if len(files) < MIN_MEDIA_GROUP:
+                logging.warning(f"Категория {directory.name} пропущена: недостаточно изображений")
+                continue
+            if len(files) > MAX_MEDIA_GROUP:
+                logging.warning(f"Категория {directory.name}: используются первые {MAX_MEDIA_GROUP} изображений")
+                files = files[:MAX_MEDIA_GROUP]
+
+            title_file = directory / TITLE_FILE
+            title = title_file.read_text(encoding='utf-8').strip() if title_file.exists() else directory.name
+            categories[directory.name] = Category(id=directory.name, title=title, files=files)
+
+        builder = InlineKeyboardBuilder()
+        for category in categories.values():
+            builder.button(text=category.title, callback_data=ReferenceCallback(category=category.id))
+        builder.button(text='🏠 Вернуться в главное меню', callback_data='🏠 Вернуться в главное меню')
+        builder.adjust(1)
+
+        self._categories = categories
+        self.markup = builder.as_markup()
+        logging.info(f"Загружено категорий примеров работ: {len(categories)}")
+
+    def get(self, category_id: str) -> Optional[Category]:
+        """
+        [RU]
+        Возвращает категорию по идентификатору.
+
+        Args:
+            category_id (str): Идентификатор категории
+
+        Returns:
+            Optional[Category]: Категория или None если не найдена
+
+        [EN]
+        Returns category by identifier.
+
+        Args:
+            category_id (str): Category identifier
+
+        Returns:
+            Optional[Category]: Category or None if not found
+        """
+        return self._categories.get(category_id)
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(self._categories.values())
+
+
+categories = CategoryRegistry()
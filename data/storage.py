@@ -0,0 +1,201 @@
+"""
+[RU]
+Модуль хранилища состояний FSM в базе данных SQLite.
+
+Состояния пользователей сохраняются в таблице fsm_states и переживают
+перезапуск бота. Последние использованные записи хранятся в памяти,
+а изменения записываются в базу данных пакетами.
+
+[EN]
+SQLite database FSM storage module.
+
+User states are stored in the fsm_states table and survive bot
+restarts. Recently used records are kept in memory, and changes
+are written to the database in batches.
+"""
+
+__all__ = ('SQLiteStorage', )
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from data.database import FSMRecord, get_db
+
+FLUSH_DELAY = 0.05
+CACHE_SIZE = 10_000
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    [RU]
+    Хранилище FSM на основе SQLite.
+
+    Изменения состояния и данных сначала попадают в кэш в памяти,
+    а через FLUSH_DELAY секунд все накопленные изменения записываются
+    в базу данных одной транзакцией. Поэтому несколько вызовов
+    update_data в одном обработчике дают одну запись в базу данных.
+    Данные состояния должны сериализоваться в JSON.
+
+    [EN]
+    SQLite based FSM storage.
+
+    State and data changes go to the in-memory cache first, and after
+    FLUSH_DELAY seconds all accumulated changes are written to the
+    database in one transaction. So several update_data calls in one
+    handler result in a single database write.
+    State data must be JSON serializable.
+    """
+
+    def __init__(self, key_builder: Optional[KeyBuilder] = None,
+                 flush_delay: float = FLUSH_DELAY, cache_size: int = CACHE_SIZE):
+        """
+        [RU]
+        Args:
+            key_builder (Optional[KeyBuilder]): Построитель ключей хранилища
+            flush_delay (float): Задержка пакетной записи в секундах
+            cache_size (int): Максимальное количество записей в памяти
+
+        [EN]
+        Args:
+            key_builder (Optional[KeyBuilder]): Storage key builder
+            flush_delay (float): Batched write delay in seconds
+            cache_size (int): Maximum number of records kept in memory
+        """
+        self.key_builder = key_builder or DefaultKeyBuilder()
+        self.flush_delay = flush_delay
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[Optional[str], Dict[str, Any]]] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def _load(self, key: StorageKey) -> tuple[str, tuple[Optional[str], Dict[str, Any]]]:
+        record_key = self.key_builder.build(key)
+        record = self._cache.get(record_key)
+        if record is not None:
+            self._cache.move_to_end(record_key)
+            return record_key, record
+
+        async with get_db() as session:
+            result = await session.execute(select(FSMRecord).where(FSMRecord.key == record_key))
+            row = result.scalar_one_or_none()
+
+        # Запись могла измениться, пока шел запрос / The record may have changed during the query
+        record = self._cache.get(record_key)
+        if record is None:
+            record = (row.state, json.loads(row.data)) if row else (None, {})
+            self._remember(record_key, record)
+        return record_key, record
+
+    def _remember(self, record_key: str, record: tuple[Optional[str], Dict[str, Any]]):
+        self._cache[record_key] = record
+        self._cache.move_to_end(record_key)
+        if len(self._cache) > self.cache_size:
+            for stale_key in list(self._cache):
+                if len(self._cache) <= self.cache_size:
+                    break
+                if stale_key not in self._dirty:
+                    del self._cache[stale_key]
+
+    def _write(self, record_key: str, record: tuple[Optional[str], Dict[str, Any]]):
+        self._remember(record_key, record)
+        self._dirty.add(record_key)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_delay)
+        while not await self.flush():
+            await asyncio.sleep(1)
+
+    async def flush(self) -> bool:
+        """
+        [RU]
+        Записывает накопленные изменения в базу данных одной транзакцией.
+
+        При ошибке или отмене изменения остаются в очереди на запись.
+
+        Returns:
+            bool: True если запись успешна, False в случае ошибки
+
+        [EN]
+        Writes accumulated changes to the database in one transaction.
+
+        On error or cancellation the changes stay queued for writing.
+
+        Returns:
+            bool: True if written successfully, False if error occurred
+        """
+        if not self._dirty:
+            return True
+
+        dirty, self._dirty = self._dirty, set()
+        records = {key: self._cache[key] for key in dirty if key in self._cache}
+        upserts = [
+            {'key': key, 'state': state, 'data': _dumps(data)}
+            for key, (state, data) in records.items() if state is not None or data
+        ]
+        deletes = [key for key, (state, data) in records.items() if state is None and not data]
+
+        written = False
+        try:
+            async with get_db() as session:
+                if upserts:
+                    query = insert(FSMRecord)
+                    await session.execute(
+                        query.on_conflict_do_update(
+                            index_elements=[FSMRecord.key],
+                            set_={'state': query.excluded.state, 'data': query.excluded.data},
+                        ),
+                        upserts,
+                    )
+                if deletes:
+                    await session.execute(delete(FSMRecord).where(FSMRecord.key.in_(deletes)))
+            written = True
+        except Exception as e:
+            logging.error(f"Ошибка при сохранении состояний FSM: {e}")
+        finally:
+            # Отмена (CancelledError) тоже возвращает ключи в очередь на запись
+            # Cancellation (CancelledError) also returns the keys to the write queue
+            if not written:
+                self._dirty |= dirty
+        return written
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record_key, (_, data) = await self._load(key)
+        self._write(record_key, (state.state if isinstance(state, State) else state, data))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        _, (state, _) = await self._load(key)
+        return state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record_key, (state, _) = await self._load(key)
+        self._write(record_key, (state, data.copy()))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, (_, data) = await self._load(key)
+        return data.copy()
+
+    async def close(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            # Прерванная запись возвращает ключи в очередь до финальной записи
+            # An interrupted write returns its keys to the queue before the final flush
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        try:
+            await self.flush()
+        finally:
+            if self._dirty:
+                logging.error(f"Не сохранено состояний FSM при остановке: {len(self._dirty)}")
@@ -12,27 +12,149 @@ Provides middleware and filter for checking if a user
 is a bot administrator.
 """
 
+import asyncio
 import logging
+import time
+from typing import Optional
 
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
 from data.database import get_admins_ids
+from loader import Config
+
+
+class AdminRegistry:
+    """
+    [RU]
+    Реестр ID администраторов в памяти.
+
+    Хранит ID администраторов в неизменяемом множестве, которое загружается
+    при запуске бота и заменяется целиком при изменениях, поэтому
+    конкурентные обновления не мешают друг другу. Может периодически
+    синхронизироваться с базой данных, если задан TTL.
+
+    [EN]
+    In-memory admin IDs registry.
+
+    Keeps admin IDs in an immutable set which is loaded at bot startup
+    and swapped as a whole on changes, so concurrent updates do not
+    interfere with each other. Can periodically re-sync with the
+    database when a TTL is set.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        [RU]
+        Args:
+            ttl (Optional[float]): Период повторной синхронизации в секундах
+
+        [EN]
+        Args:
+            ttl (Optional[float]): Re-sync period in seconds
+        """
+        self.ttl = ttl
+        self._ids: frozenset[int] = frozenset()
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._ids
+
+    @property
+    def ids(self) -> frozenset[int]:
+        """
+        [RU]
+        Текущее множество ID администраторов.
+
+        [EN]
+        Current set of admin IDs.
+        """
+        return self._ids
+
+    async def load(self):
+        """
+        [RU]
+        Загружает ID администраторов из базы данных.
+
+        При ошибке базы данных сохраняется предыдущее множество.
+
+        [EN]
+        Loads admin IDs from the database.
+
+        The previous set is kept if the database query fails.
+        """
+        async with self._lock:
+            ids = await get_admins_ids()
+            if ids is None:
+                return
+            self._ids = frozenset(ids)
+            self._loaded_at = time.monotonic()
+            logging.info(f"Загружено администраторов: {len(self._ids)}")
+
+    async def sync(self):
+        """
+        [RU]
+        Перезагружает реестр, если истек TTL.
+
+        [EN]
+        Reloads the registry if the TTL has expired.
+        """
+        if self.ttl is None or (
+                self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl):
+            return
+        if self._lock.locked():
+            return
+        await self.load()
+
+    def add(self, user_id: int):
+        """
+        [RU]
+        Добавляет администратора в реестр.
+
+        Args:
+            user_id (int): Telegram ID администратора
+
+        [EN]
+        Adds admin to the registry.
+
+        Args:
+            user_id (int): Telegram admin ID
+        """
+        self._ids = self._ids | {user_id}
+
+    def discard(self, user_id: int):
+        """
+        [RU]
+        Удаляет администратора из реестра.
+
+        Args:
+            user_id (int): Telegram ID администратора
+
+        [EN]
+        Removes admin from the registry.
+
+        Args:
+            user_id (int): Telegram admin ID
+        """
+        self._ids = self._ids - {user_id}
+
+
+admins = AdminRegistry(ttl=Config().get_admins_ttl())
 
-admins_ids = []
 
 class AdminMiddleware:
     """
     [RU]
-    Middleware для загрузки списка ID администраторов.
+    Middleware для синхронизации реестра администраторов.
     
-    Обновляет глобальный список ID администраторов при каждом запросе,
-    обеспечивая актуальность данных для фильтра AdminFilter.
+    Перезагружает реестр из базы данных только если задан TTL и он истек,
+    в остальных случаях обращения к базе данных не происходит.
 
     [EN]
-    Middleware for loading admin IDs list.
+    Middleware for admin registry synchronization.
     
-    Updates global admin IDs list on each request,
-    ensuring data relevance for AdminFilter.
+    Reloads the registry from the database only when a TTL is set
+    and has expired, otherwise no database query is made.
     """
     async def __call__(self, handler, event, data):
         """
@@ -58,8 +180,7 @@ class AdminMiddleware:
         Returns:
             Any: Handler execution result
         """
-        global admins_ids
-        admins_ids = await get_admins_ids()
+        await admins.sync()
 
         return await handler(event, data)
 
@@ -70,13 +191,13 @@ class AdminFilter(BaseFilter):
     Фильтр для проверки прав администратора.
     
     Проверяет, является ли отправитель сообщения администратором бота,
-    сравнивая его ID со списком ID администраторов.
+    проверяя наличие его ID в реестре администраторов.
 
     [EN]
     Filter for checking admin rights.
     
     Checks if message sender is a bot administrator by
-    comparing their ID with admin IDs list.
+    checking their ID against the admin registry.
     """
     async def __call__(self, message: Message) -> bool:
         """
@@ -98,4 +219,4 @@ class AdminFilter(BaseFilter):
         Returns:
             bool: True if user is admin, False if not
         """
-        return message.from_user.id in admins_ids
+        return message.from_user.id in admins
@@ -1,16 +1,23 @@
+import html
 import logging
+import os
+from datetime import datetime
 
 from aiogram import Router, F
 from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
-from aiogram.types import Message
+from aiogram.types import FSInputFile, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from icecream import ic
+from utils.debug import trace
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from data.database import async_session, Question, Answer, Group
+from data.database import async_session, Question, Answer, Broadcast, upsert_group, update_broadcast
 from filters.admin_filter import AdminFilter, AdminMiddleware
+from handlers.interview.questions import question_cache
+from utils.broadcast import broadcaster
+from utils.export import FORMATS, TABLES, export
+from utils.messages import message_ref, restore_message
 
 router = Router(name=__name__)
 router.message.filter(AdminFilter())
@@ -25,12 +32,8 @@ text = '<b>Question:</b>\n' + \
 
 @router.message(Command('add_group'), F.chat.type.in_(['group', 'supergroup']))
 async def adding_group(message: Message, session: AsyncSession):
-    ic(message)
-    group = Group(
-        id=message.chat.id,
-        title=message.chat.title,
-    )
-    session.add(group)
+    trace(message)
+    await upsert_group(session, message.chat.id, message.chat.title)
     await session.commit()
 
     await message.answer(
@@ -67,6 +70,152 @@ async def assign_an_admin(message: Message, command: CommandObject):
     )
 
 
+@router.message(Command('export'))
+async def export_table(message: Message, command: CommandObject):
+    """
+    [RU]
+    Выгружает пользователей или заявки в сжатый файл и отправляет его документом.
+
+    Формат команды: /export [users|leads] [csv|jsonl], по умолчанию - /export leads csv.
+
+    Args:
+        message (Message): Объект сообщения Telegram
+        command (CommandObject): Объект команды с аргументами
+
+    [EN]
+    Exports users or applications to a compressed file and sends it as a document.
+
+    Command format: /export [users|leads] [csv|jsonl], defaults to /export leads csv.
+
+    Args:
+        message (Message): Telegram message object
+        command (CommandObject): Command object with arguments
+    """
+    args = (command.args or '').lower().split()
+    table = next((arg for arg in args if arg in TABLES), 'leads')
+    file_format = next((arg for arg in args if arg in FORMATS), 'csv')
+    if set(args) - set(TABLES) - set(FORMATS):
+        await message.answer(
+            text=f"Формат команды: /export [{'|'.join(TABLES)}] [{'|'.join(FORMATS)}]"
+        )
+        return
+
+    logging.info(f"Выгрузка {table} в {file_format} для администратора {message.from_user.id}")
+    try:
+        path, count = await export(table, file_format)
+    except Exception as e:
+        logging.error(f"Ошибка при выгрузке {table}: {e}")
+        await message.answer(
+            text=f"❌ Не удалось выгрузить данные: {e}"
+        )
+        return
+
+    try:
+        await message.answer_document(
+            document=FSInputFile(path, filename=f'{table}-{datetime.now():%Y%m%d-%H%M}.{file_format}.gz'),
+            caption=f"Записей: {count}"
+        )
+    finally:
+        os.remove(path)
+
+
+@router.message(Command('broadcast'))
+async def start_broadcast(message: Message, command: CommandObject, session: AsyncSession):
+    """
+    [RU]
+    Создает рассылку пользователям или группам с включенной рассылкой.
+
+    Формат команды: /broadcast users|groups текст. Если команда отправлена
+    ответом на сообщение, рассылается текст этого сообщения с форматированием.
+    Ход рассылки отображается в отдельном сообщении, которое обновляется.
+
+    Args:
+        message (Message): Объект сообщения Telegram
+        command (CommandObject): Объект команды с аргументами
+        session (AsyncSession): Сессия базы данных
+
+    [EN]
+    Creates a broadcast to users or to groups with mailing enabled.
+
+    Command format: /broadcast users|groups text. If the command is sent
+    as a reply to a message, that message text is broadcast with formatting.
+    Broadcast progress is shown in a separate message that is updated.
+
+    Args:
+        message (Message): Telegram message object
+        command (CommandObject): Command object with arguments
+        session (AsyncSession): Database session
+    """
+    # Текст может начинаться с новой строки / The text may start on a new line
+    audience, text = ((command.args or '').split(maxsplit=1) + ['', ''])[:2]
+    text = html.escape(text.strip())
+    if message.reply_to_message and message.reply_to_message.text:
+        text = message.reply_to_message.html_text
+    if audience not in ('users', 'groups') or not text:
+        await message.answer(
+            text="Формат команды: /broadcast users|groups текст\n"
+                 "или ответ на сообщение командой /broadcast users|groups"
+        )
+        return
+
+    status = await message.answer(
+        text="📣 Рассылка поставлена в очередь"
+    )
+    broadcast = Broadcast(
+        audience=audience,
+        text=text,
+        chat_id=status.chat.id,
+        message_id=status.message_id,
+    )
+    session.add(broadcast)
+    await session.commit()
+    broadcaster.notify()
+    logging.info(f"Рассылка {broadcast.id} ({audience}) создана администратором {message.from_user.id}")
+
+
+@router.message(Command('broadcast_cancel'))
+async def cancel_broadcast(message: Message, command: CommandObject, session: AsyncSession):
+    """
+    [RU]
+    Отменяет рассылку. Отправка останавливается в течение секунды, даже во время паузы RetryAfter.
+
+    Формат команды: /broadcast_cancel ID
+
+    Args:
+        message (Message): Объект сообщения Telegram
+        command (CommandObject): Объект команды с аргументами
+        session (AsyncSession): Сессия базы данных
+
+    [EN]
+    Cancels a broadcast. Sending stops within about a second, even during a RetryAfter pause.
+
+    Command format: /broadcast_cancel ID
+
+    Args:
+        message (Message): Telegram message object
+        command (CommandObject): Command object with arguments
+        session (AsyncSession): Database session
+    """
+    if not (command.args or '').strip().isdigit():
+        await message.answer(
+            text="Формат команды: /broadcast_cancel ID"
+        )
+        return
+
+    broadcast = await session.get(Broadcast, int(command.args))
+    if not broadcast or broadcast.status not in ('pending', 'running'):
+        await message.answer(
+            text=f"Активная рассылка #{int(command.args)} не найдена"
+        )
+        return
+
+    await update_broadcast(session, broadcast.id, status='cancelled')
+    await session.commit()
+    await message.answer(
+        text=f"Рассылка #{broadcast.id} будет остановлена"
+    )
+
+
 class SetQuestion(StatesGroup):
     question = State()
     answer = State()
@@ -92,7 +241,7 @@ async def add_question(message: Message, command: CommandObject, state: FSMConte
             text='Enter your question in next message 👇',
             reply_markup=builder.as_markup()
         )
-        await state.update_data(message=msg)
+        await state.update_data(message=message_ref(msg))
 
 
 builder = InlineKeyboardBuilder()
@@ -108,7 +257,7 @@ builder.adjust(1)
 async def enter_question(message: Message, state: FSMContext, question):
     await state.update_data(question=question)
     await state.set_state(SetQuestion.answer)
-    msg = await state.get_value('message', None)
+    msg = restore_message(message.bot, await state.get_value('message', None))
 
     if not msg:
         func = message.answer
@@ -122,7 +271,7 @@ async def enter_question(message: Message, state: FSMContext, question):
         reply_markup=builder.as_markup()
     )
 
-    await state.update_data(message=msg)
+    await state.update_data(message=message_ref(msg))
     await message.delete()
 
 
@@ -132,7 +281,7 @@ async def add_answer(message: Message, state: FSMContext, answer):
     answers: list = await state.get_value('answers', [])
     answers.append(answer)
     await state.update_data(answers=answers)
-    msg: Message = await state.get_value('message')
+    msg = restore_message(message.bot, await state.get_value('message'))
     await msg.edit_text(
         text=text.format(
             question=question,
@@ -168,6 +317,7 @@ async def save_to_database(callback_query, state: FSMContext):
                     session.add(new_answer)
                 # Коммит произойдет автоматически при выходе из контекстного менеджера
 
+            question_cache.invalidate()
             await callback_query.message.edit_text(
                 "✅ Вопрос и ответы успешно сохранены в базу данных!"
             )
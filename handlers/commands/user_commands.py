@@ -5,10 +5,10 @@ from aiogram import Router, F
 from aiogram.filters import CommandStart, Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
-from icecream import ic
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from data.database import get_user, User, get_db, Admin
+from data.database import get_user, User, get_db, upsert_admin
+from filters.admin_filter import admins
 from handlers.menu import main_menu, start_message
 from handlers.interview import name
 
@@ -21,7 +21,7 @@ router.message.filter(~F.chat.type.in_(['group', 'supergroup']))
 @router.message(CommandStart())
 async def wellcome(message: Message, state: FSMContext, session: AsyncSession):
     await state.clear()
-    user: User = await get_user(message.from_user.id)
+    user: User = await get_user(message.from_user.id, session)
     if user:
         await start_message(message, user.name)
     else:
@@ -42,12 +42,9 @@ async def pin(message: Message, command: CommandObject, session: AsyncSession):
 
         if password_hash == saved_hash:
             await message.answer("Пароль верный! ✅")
-            admin = Admin(
-                id=message.from_user.id,
-                username=message.from_user.username
-            )
-            session.add(admin)
+            await upsert_admin(session, message.from_user.id, message.from_user.username)
             await session.commit()
+            admins.add(message.from_user.id)
         else:
             await message.answer("Неверный пароль! ❌")
 
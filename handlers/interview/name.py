@@ -24,7 +24,7 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from data.database import User
+from data.database import User, upsert_user, user_cache
 from handlers.menu import start_message
 from states.user_states import Interview
 
@@ -90,7 +90,7 @@ async def input_my_name_is(message: Message, state: FSMContext, session: AsyncSe
         session (AsyncSession): Database session
     """
     user = message.text
-    await add_user(user, session)
+    await add_user(message.from_user, session, name=user)
     await start_message(message, user)
     await state.clear()
 
@@ -123,30 +123,39 @@ async def callback_my_name_is(callback: CallbackQuery, state: FSMContext, sessio
     await start_message(callback.message, callback.data)
     await state.clear()
 
-async def add_user(user, session):
+async def add_user(user, session, name=None):
     """
     [RU]
-    Добавляет информацию о пользователе в базу данных.
+    Добавляет или обновляет информацию о пользователе в базе данных
+    и кэше пользователей.
+
+    Повторный вызов для существующего пользователя обновляет его
+    username и имя без ошибки первичного ключа.
 
     Args:
         user: Объект пользователя Telegram
         session: Сессия базы данных
+        name: Имя пользователя, по умолчанию - имя из профиля Telegram
 
     [EN]
-    Adds user information to database.
+    Adds or updates user information in database and the user cache.
+
+    A repeated call for an existing user updates their username and
+    name without a primary key error.
 
     Args:
         user: Telegram user object
         session: Database session
+        name: User name, defaults to the Telegram profile first name
     """
     try:
-        session.add(User(
+        _user = User(
             id=user.id,
             username=user.username,
-            name=user.first_name,
-        ))
+            name=name or user.first_name,
+        )
+        await upsert_user(session, _user.id, _user.username, _user.name)
         await session.commit()
+        user_cache.put(_user)
     except Exception as e:
         logging.error(e)
-
-
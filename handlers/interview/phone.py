@@ -12,26 +12,63 @@ Manages the process of requesting and receiving user's phone number,
 and sending collected information to managers in the group.
 """
 
-import asyncio
 import logging
+from typing import Optional
 
-from aiogram import Router, F
+from aiogram import Bot, Router, F
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, KeyboardButton, ReplyKeyboardRemove
 from aiogram.utils.keyboard import ReplyKeyboardMarkup
-from icecream import ic
+from utils.debug import trace
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from data.database import User, get_user, Group
+from data.database import User, get_user, get_mailing_groups_ids, enqueue_messages
 from handlers.menu import main_menu
+from states.snapshot import StateSnapshot
 from states.user_states import Interview
+from utils.messages import message_ref, restore_message
+from utils.leads import lead_writer
+from utils.outbox import outbox
 
 router = Router(name=__name__)
 
+contact_markup = ReplyKeyboardMarkup(
+    keyboard=[[KeyboardButton(text='Поделиться контактом', request_contact=True, )]],
+    resize_keyboard=True
+)
+
+
+def build_lead_text(username: Optional[str], name: str, answers: dict[str, str]) -> str:
+    """
+    [RU]
+    Формирует текст заявки для менеджеров.
+
+    Args:
+        username (Optional[str]): Username пользователя в Telegram
+        name (str): Имя пользователя
+        answers (dict[str, str]): Ответы на вопросы анкеты
+
+    Returns:
+        str: Текст заявки
+
+    [EN]
+    Builds the application text for managers.
+
+    Args:
+        username (Optional[str]): User's Telegram username
+        name (str): User name
+        answers (dict[str, str]): Questionnaire answers
+
+    Returns:
+        str: Application text
+    """
+    text = f'#заявка\nПользователь:\n{'@' + username if username else ''}\n{name}\n'
+    return text + '\n'.join([f'<b>Q: {key}</b>\nA: {value}\n' for key, value in answers.items()])
+
 
 @router.message(StateFilter(Interview.question))
-async def ask_phone(state: FSMContext):
+async def ask_phone(state: FSMContext, bot: Bot):
     """
     [RU]
     Запрашивает номер телефона у пользователя.
@@ -40,6 +77,7 @@ async def ask_phone(state: FSMContext):
 
     Args:
         state (FSMContext): Контекст состояния FSM
+        bot (Bot): Объект бота
 
     [EN]
     Requests phone number from user.
@@ -48,20 +86,19 @@ async def ask_phone(state: FSMContext):
 
     Args:
         state (FSMContext): FSM state context
+        bot (Bot): Bot object
     """
-    message: Message = await state.get_value('message')
-    question = '📞 Оставьте ваш номер телефона, чтобы менеджер мог с вами связаться.'
-    await state.set_state(Interview.phone)
-    _message = await message.answer(
-        text=question,
-        reply_markup=ReplyKeyboardMarkup(
-            keyboard=[[KeyboardButton(text='Поделиться контактом', request_contact=True, )]],
-            resize_keyboard=True
+    async with StateSnapshot(state) as snapshot:
+        message = restore_message(bot, snapshot.get('message'))
+        question = '📞 Оставьте ваш номер телефона, чтобы менеджер мог с вами связаться.'
+        snapshot.set_state(Interview.phone)
+        _message = await message.answer(
+            text=question,
+            reply_markup=contact_markup
         )
-    )
-    await message.delete()
+        await message.delete()
 
-    await state.update_data(question=question, message=_message)
+        snapshot.update(question=question, message=message_ref(_message))
 
 
 @router.message(F.text | F.contact, StateFilter(Interview.phone))
@@ -70,8 +107,10 @@ async def get_contact(message: Message, state: FSMContext, session: AsyncSession
     [RU]
     Обрабатывает полученный контакт или текстовый номер телефона.
     
-    Сохраняет контактные данные и отправляет заявку менеджерам.
-    После успешной отправки возвращает пользователя в главное меню.
+    Сохраняет контактные данные, передает заявку на запись в базу данных
+    и ставит ее в очередь отправки во все группы менеджеров
+    с включенной рассылкой.
+    Затем сразу возвращает пользователя в главное меню.
 
     Args:
         message (Message): Объект сообщения Telegram
@@ -81,50 +120,45 @@ async def get_contact(message: Message, state: FSMContext, session: AsyncSession
     [EN]
     Processes received contact or text phone number.
     
-    Saves contact information and sends application to managers.
-    Returns user to main menu after successful submission.
+    Saves contact information, hands the application over for writing
+    to the database and queues it for delivery to all manager groups
+    with mailing enabled.
+    Then immediately returns user to main menu.
 
     Args:
         message (Message): Telegram message object
         state (FSMContext): FSM state context
         session (AsyncSession): Database session
     """
-    _message = await state.get_value('message', None)
-    question = await state.get_value('question', None)
-    answers = await state.get_value('answers', {})
-
-    if _message:
-        await _message.delete()
-
-    if question:
-        phone_number = message.contact.phone_number if message.contact else message.text
-        answers[question] = f'<a href="tel:+{phone_number}">+{phone_number}</a>'
-
-        # message for managers
-        user: User = await get_user(message.from_user.id)
-        text = f'#заявка\nПользователь:\n{'@' + message.from_user.username if message.from_user.username else ''}\n{user.name}\n'
-        text += '\n'.join([f'<b>Q: {key}</b>\nA: {value}\n' for key, value in answers.items()])
-        try:
-            from sqlalchemy import select
-
-            query = select(Group.id)
-            result = await session.execute(query)
-            groups = result.scalars().all()
-
-            for group in groups:
-                await message.bot.send_message(
-                    chat_id=group,
-                    text=text
+    async with StateSnapshot(state) as snapshot:
+        _message = restore_message(message.bot, snapshot.get('message'))
+        question = snapshot.get('question')
+        answers = snapshot.get('answers', {})
+
+        if _message:
+            await _message.delete()
+
+        if question:
+            phone_number = message.contact.phone_number if message.contact else message.text
+            user: User = await get_user(message.from_user.id, session)
+            lead_writer.add(message.from_user.id, message.from_user.username, user.name, phone_number, answers)
+            answers[question] = f'<a href="tel:+{phone_number}">+{phone_number}</a>'
+
+            # message for managers
+            text = build_lead_text(message.from_user.username, user.name, answers)
+            try:
+                groups = await get_mailing_groups_ids(session)
+                await enqueue_messages(session, groups, text)
+                await session.commit()
+                outbox.notify()
+
+            except Exception as e:
+                logging.error(f"Ошибка при проверке пользователя: {e}")
+            finally:
+                trace('Тут вообще происходит что то?')
+                _message = await message.answer(
+                    text='✅ Отлично! Ваша заявка принята. Менеджер свяжется с Вами в ближайшее время',
+                    reply_markup=ReplyKeyboardRemove()
                 )
-
-        except Exception as e:
-            logging.error(f"Ошибка при проверке пользователя: {e}")
-        finally:
-            ic('Тут вообще происходит что то?')
-            _message = await message.answer(
-                text='✅ Отлично! Ваша заявка принята. Менеджер свяжется с Вами в ближайшее время',
-                reply_markup=ReplyKeyboardRemove()
-            )
-            await asyncio.sleep(1)
-            await main_menu(message, state)
-            await state.clear()
+                snapshot.clear()
+                await main_menu(message)
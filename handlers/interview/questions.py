@@ -13,51 +13,276 @@ processes answers and determines the next question based on user responses.
 """
 
 import asyncio
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 from aiogram import Router, F
 from aiogram.filters import StateFilter
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from icecream import ic
+from utils.debug import trace
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from loader import Config
 from data.database import Question, get_db, get_all_questions_with_answers
 from handlers.interview import phone
+from states.snapshot import StateSnapshot
 from states.user_states import Interview
+from utils.messages import message_ref, restore_message
 
 router = Router(name=__name__)
 router.message.filter(StateFilter(Interview.question))
 router.callback_query.filter(StateFilter(Interview.question))
 
-questions_cache = {}
+class AnswerCallback(CallbackData, prefix='a'):
+    """
+    [RU]
+    Callback data кнопки ответа на вопрос анкеты.
+
+    Содержит только ID ответа, текст ответа берется из графа вопросов.
+
+    Attributes:
+        answer_id (int): ID ответа
+
+    [EN]
+    Callback data of a questionnaire answer button.
 
+    Holds only the answer ID, the answer text is taken from the question graph.
 
-async def load_questions():
+    Attributes:
+        answer_id (int): Answer ID
+    """
+    answer_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerNode:
     """
     [RU]
-    Загрузка всех вопросов в кэш при старте.
+    Вариант ответа в графе вопросов.
+
+    Attributes:
+        id (int): ID ответа
+        content (str): Текст ответа
+        next (Optional[int]): ID следующего вопроса
+
+    [EN]
+    Answer option in the question graph.
+
+    Attributes:
+        id (int): Answer ID
+        content (str): Answer text
+        next (Optional[int]): Next question ID
+    """
+    id: int
+    content: str
+    next: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionNode:
+    """
+    [RU]
+    Вопрос в графе вопросов.
+
+    Attributes:
+        id (int): ID вопроса
+        content (str): Текст вопроса
+        answers (tuple[AnswerNode, ...]): Варианты ответов
+        markup (InlineKeyboardMarkup): Готовая клавиатура с вариантами ответов
+
+    [EN]
+    Question in the question graph.
+
+    Attributes:
+        id (int): Question ID
+        content (str): Question text
+        answers (tuple[AnswerNode, ...]): Answer options
+        markup (InlineKeyboardMarkup): Prebuilt keyboard with answer options
+    """
+    id: int
+    content: str
+    answers: tuple[AnswerNode, ...]
+    markup: InlineKeyboardMarkup
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionGraph:
+    """
+    [RU]
+    Неизменяемый снимок графа вопросов.
+
+    Attributes:
+        version (int): Версия кэша, из которой построен снимок
+        questions (Mapping[int, QuestionNode]): Вопросы по ID
+        answers (Mapping[int, AnswerNode]): Ответы по ID
+
+    [EN]
+    Immutable question graph snapshot.
+
+    Attributes:
+        version (int): Cache version the snapshot was built from
+        questions (Mapping[int, QuestionNode]): Questions by ID
+        answers (Mapping[int, AnswerNode]): Answers by ID
+    """
+    version: int
+    questions: Mapping[int, QuestionNode]
+    answers: Mapping[int, AnswerNode]
+
+    def get(self, question_id: int) -> Optional[QuestionNode]:
+        return self.questions.get(question_id)
+
+
+def compile_question(question: Question) -> QuestionNode:
+    """
+    [RU]
+    Строит узел графа вопросов вместе с его клавиатурой.
+
+    Args:
+        question (Question): Вопрос из базы данных с вариантами ответов
+
+    Returns:
+        QuestionNode: Узел графа вопросов
+
+    [EN]
+    Builds a question graph node together with its keyboard.
+
+    Args:
+        question (Question): Database question with answer options
+
+    Returns:
+        QuestionNode: Question graph node
+    """
+    answers = tuple(
+        AnswerNode(id=answer.id, content=answer.content, next=answer.next)
+        for answer in question.answers
+    )
+
+    builder = InlineKeyboardBuilder()
+    for answer in answers:
+        builder.button(text=answer.content, callback_data=AnswerCallback(answer_id=answer.id))
+    builder.button(text='🏠 Вернуться в главное меню', callback_data='главное меню')
+    builder.adjust(1)
+
+    return QuestionNode(id=question.id, content=question.content, answers=answers, markup=builder.as_markup())
+
+
+class QuestionCache:
+    """
+    [RU]
+    Кэш графа вопросов с версионированием.
+
+    Каждое изменение вопросов администратором увеличивает версию кэша.
+    Устаревший снимок перезагружается из базы данных только одной
+    корутиной, остальные ждут её результат, после чего снимок
+    атомарно заменяется.
+
+    [EN]
+    Versioned question graph cache.
+
+    Every admin change to questions bumps the cache version.
+    An outdated snapshot is reloaded from the database by a single
+    coroutine while the others wait for its result, then the snapshot
+    is swapped atomically.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        [RU]
+        Args:
+            ttl (Optional[float]): Время жизни снимка в секундах. Нужно, если
+                вопросы изменяются в другом процессе бота.
+
+        [EN]
+        Args:
+            ttl (Optional[float]): Snapshot lifetime in seconds. Needed when
+                questions are changed in another bot process.
+        """
+        self.ttl = ttl
+        self._version = 0
+        self._snapshot: Optional[QuestionGraph] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """
+        [RU]
+        Помечает текущий снимок как устаревший.
+
+        [EN]
+        Marks the current snapshot as outdated.
+        """
+        self._version += 1
+
+    def _fresh(self) -> Optional[QuestionGraph]:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version and (
+                self.ttl is None or time.monotonic() - self._loaded_at < self.ttl):
+            return snapshot
+        return None
+
+    async def get(self) -> QuestionGraph:
+        """
+        [RU]
+        Возвращает актуальный снимок графа вопросов.
+
+        Returns:
+            QuestionGraph: Снимок графа вопросов
+
+        [EN]
+        Returns an up-to-date question graph snapshot.
+
+        Returns:
+            QuestionGraph: Question graph snapshot
+        """
+        if snapshot := self._fresh():
+            return snapshot
+
+        async with self._lock:
+            if snapshot := self._fresh():
+                return snapshot
+
+            trace('No cache')
+            version = self._version
+            async with get_db() as session:
+                questions = await get_all_questions_with_answers(session)
+
+            nodes = {question.id: compile_question(question) for question in questions}
+            self._snapshot = QuestionGraph(
+                version=version,
+                questions=MappingProxyType(nodes),
+                answers=MappingProxyType({answer.id: answer for node in nodes.values() for answer in node.answers}),
+            )
+            self._loaded_at = time.monotonic()
+            return self._snapshot
+
+
+question_cache = QuestionCache(ttl=Config().get_questions_ttl())
+
+
+async def load_questions() -> QuestionGraph:
+    """
+    [RU]
+    Возвращает граф вопросов, при необходимости загружая его из базы данных.
     
     Returns:
-        dict: Словарь с вопросами, где ключ - id вопроса.
+        QuestionGraph: Снимок графа вопросов.
 
     [EN]
-    Load all questions into cache at startup.
+    Returns the question graph, loading it from the database if needed.
     
     Returns:
-        dict: Dictionary with questions where key is question id.
+        QuestionGraph: Question graph snapshot.
     """
-    if not questions_cache:
-        ic('No cache')
-        async with get_db() as session:
-            questions = await get_all_questions_with_answers(session)
-            for question in questions:
-                questions_cache[question.id] = question
-    return questions_cache
+    return await question_cache.get()
 
 
 @router.message(F.text.as_('answer'))
-async def ask_question(message: Message, state: FSMContext, answer=None):
+async def ask_question(message: Message, state: FSMContext, answer: str = None, next_index: int = None):
     """
     [RU]
     Обработчик для отображения вопроса и обработки ответа пользователя.
@@ -66,6 +291,7 @@ async def ask_question(message: Message, state: FSMContext, answer=None):
         message (Message): Объект сообщения Telegram
         state (FSMContext): Контекст состояния FSM
         answer (str, optional): Предыдущий ответ пользователя
+        next_index (int, optional): ID следующего вопроса, по умолчанию следующий по порядку
 
     [EN]
     Handler for displaying question and processing user's answer.
@@ -74,72 +300,69 @@ async def ask_question(message: Message, state: FSMContext, answer=None):
         message (Message): Telegram message object
         state (FSMContext): FSM state context
         answer (str, optional): Previous user's answer
+        next_index (int, optional): Next question ID, the following one by default
     """
-    _message = await state.get_value('message', None)
-    _index = await state.get_value('index', 1)
-    _question = await state.get_value('question', None)
-    _answers = await state.get_value('answers', {})
-
-    if _question:
-        if (new_answer := answer.split(':'))[-1].isdigit():
-            _index = int(new_answer[-1])
-        else:
-            _index += 1
-
-        _answers[_question] = new_answer[0]
-        await state.update_data(answers=_answers)
-
-    text = None
-    builder = InlineKeyboardBuilder()
+    async with StateSnapshot(state) as snapshot:
+        _message = restore_message(message.bot, snapshot.get('message'))
+        _index = snapshot.get('index', 1)
+        _question = snapshot.get('question')
+        _answers = snapshot.get('answers', {})
 
-    if _message:
-        send = _message.edit_text
-    else:
-        _message = message
-        send = _message.answer
+        if _question:
+            _index = next_index if next_index is not None else _index + 1
+            _answers[_question] = answer
+            snapshot.update(answers=_answers)
 
-    if message.bot.id != message.from_user.id:
-        await message.delete()
+        if _message:
+            send = _message.edit_text
+        else:
+            _message = message
+            send = _message.answer
 
-    # Используем кэшированные вопросы
-    await load_questions()
-    question = questions_cache.get(_index)
+        if message.bot.id != message.from_user.id:
+            await message.delete()
 
-    if question:
-        text = question.content
-        await state.update_data(question=text)
-        for answer in question.answers:
-            builder.button(text=answer.content, callback_data=':'.join([str(answer.content), str(answer.next)]))
-        builder.button(text='🏠 Вернуться в главное меню', callback_data='главное меню')
+        # Используем кэшированные вопросы
+        question = (await load_questions()).get(_index)
 
-    builder.adjust(1)
-    if not text:
-        ic('not text')
-        await phone.ask_phone(state=state)
-    else:
-        _message = await send(
-            text=text,
-            reply_markup=builder.as_markup()
-        )
-        await state.update_data(message=_message, index=_index)
+        if not question:
+            trace('not text')
+            await phone.ask_phone(state=state, bot=message.bot)
+        else:
+            _message = await send(
+                text=question.content,
+                reply_markup=question.markup
+            )
+            snapshot.update(question=question.content, message=message_ref(_message), index=_index)
 
 
-@router.callback_query(~F.data.contains('главное меню'))
-async def ask_question_callback(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(AnswerCallback.filter())
+async def ask_question_callback(callback: CallbackQuery, callback_data: AnswerCallback, state: FSMContext):
     """
     [RU]
     Обработчик callback-запросов для ответов на вопросы.
 
+    Текст ответа и следующий вопрос определяются по ID ответа
+    из графа вопросов.
+
     Args:
         callback (CallbackQuery): Объект callback запроса
+        callback_data (AnswerCallback): Данные выбранного ответа
         state (FSMContext): Контекст состояния FSM
 
     [EN]
     Callback query handler for question answers.
 
+    The answer text and the next question are resolved by the answer ID
+    from the question graph.
+
     Args:
         callback (CallbackQuery): Callback query object
+        callback_data (AnswerCallback): Selected answer data
         state (FSMContext): FSM state context
     """
     await callback.answer()
-    await ask_question(callback.message, state, callback.data)
+    answer = (await load_questions()).answers.get(callback_data.answer_id)
+    if answer is None:
+        return
+    await ask_question(callback.message, state, answer.content, answer.next)
@@ -15,13 +15,18 @@ and information display to the user.
 """
 
 import html
-from pathlib import Path
 
 from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto, Message
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from data.media import media_cache
+from data.references import ReferenceCallback, categories
+from states.snapshot import StateSnapshot
 from states.user_states import Interview, Reference
+from utils.messages import message_ref
 
 router = Router(name=__name__)
 
@@ -31,6 +36,41 @@ hello_message = '''👋 Приветствуем Вас, {user}!\n
 Давайте разберемся, какой сайт Вам нужен!'''
 
 
+def build_markup(names: list[str], *sizes: int) -> InlineKeyboardMarkup:
+    """
+    [RU]
+    Строит клавиатуру, в которой callback data кнопки совпадает с её текстом.
+
+    Args:
+        names (list[str]): Тексты кнопок
+        *sizes (int): Количество кнопок в рядах
+
+    Returns:
+        InlineKeyboardMarkup: Готовая клавиатура
+
+    [EN]
+    Builds a keyboard where button callback data equals its text.
+
+    Args:
+        names (list[str]): Button texts
+        *sizes (int): Number of buttons per row
+
+    Returns:
+        InlineKeyboardMarkup: Ready keyboard
+    """
+    builder = InlineKeyboardBuilder()
+    for name in names:
+        builder.button(text=name, callback_data=name)
+    builder.adjust(*sizes)
+    return builder.as_markup()
+
+
+# Статические клавиатуры строятся один раз / Static keyboards are built once
+main_menu_markup = build_markup(['💻 Заказать сайт', '📞 Наши контакты', '📂 Примеры работ'], 1, 2)
+contacts_markup = build_markup(["💻 Заказать сайт", "📂 Примеры работ", "🏠 Главное меню"], 2, 1)
+reference_markup = build_markup(['Назад', '🏠 Вернуться в главное меню'], 1)
+
+
 async def start_message(message: Message, name):
     """
     [RU]
@@ -74,15 +114,10 @@ async def main_menu(message: Message, state: FSMContext = None):
     if state:
         await state.clear()
 
-    builder = InlineKeyboardBuilder()
-    for name in ['💻 Заказать сайт', '📞 Наши контакты', '📂 Примеры работ']:
-        builder.button(text=name, callback_data=name)
-    builder.adjust(1, 2)
-
     await message.delete()
     await message.answer(
         text="🏠 Вы находитесь в главном меню",
-        reply_markup=builder.as_markup()
+        reply_markup=main_menu_markup
     )
 
 
@@ -125,17 +160,12 @@ async def main_contact(callback: CallbackQuery, state: FSMContext):
     """
     await state.clear()
 
-    builder = InlineKeyboardBuilder()
-    for name in ["💻 Заказать сайт", "📂 Примеры работ", "🏠 Главное меню"]:
-        builder.button(text=name, callback_data=name)
-    builder.adjust(2, 1)
-
     await callback.message.edit_text(
         text=f'Свяжитесь с нами:\n\n'
              f'📞 Телефон: +79991551043\n'
              f'📧 Email: site-it@mail.ru\n'
              f'📱 Telegram: @site_it',
-        reply_markup=builder.as_markup()
+        reply_markup=contacts_markup
     )
 
 
@@ -159,23 +189,9 @@ async def main_reference(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await state.set_state(Reference.view)
 
-    ref_list = ["🚗 Автомобили",
-                "💄 Бьюти-сфера",
-                "🏗 Строительство",
-                "🍕 Еда и товары",
-                "🏭 Промышленность",
-                "🏠 Ремонтные работы",
-                "👨‍💻 Специалисты",
-                "🏠 Вернуться в главное меню"]
-
-    builder = InlineKeyboardBuilder()
-    for name in ref_list:
-        builder.button(text=name, callback_data=name)
-    builder.adjust(1)
-
     await callback.message.edit_text(
         text=f"<b>Примеры работ.</b>\n\nВыберите категорию.",
-        reply_markup=builder.as_markup()
+        reply_markup=categories.markup
     )
 
 
@@ -196,58 +212,48 @@ async def main_order(callback: CallbackQuery, state: FSMContext):
         callback (CallbackQuery): Callback query object
         state (FSMContext): FSM state context
     """
-    await state.clear()
-    await state.set_state(Interview.question)
-    await state.update_data(message=callback.message,)
-
     from handlers.interview.questions import ask_question
-    await ask_question(callback.message, state)
 
+    async with StateSnapshot(state) as snapshot:
+        snapshot.clear()
+        snapshot.set_state(Interview.question)
+        snapshot.update(message=message_ref(callback.message))
+        await ask_question(callback.message, state)
 
-@router.callback_query(Reference.view, ~F.data.contains('Назад'))
-async def view_reference(callback: CallbackQuery):
+
+@router.callback_query(Reference.view, ReferenceCallback.filter())
+async def view_reference(callback: CallbackQuery, callback_data: ReferenceCallback, session: AsyncSession):
     """
     [RU]
     Показывает примеры работ выбранной категории.
 
+    Фотографии отправляются через кэш file_id, поэтому файлы
+    загружаются в Telegram только один раз.
+
     Args:
         callback (CallbackQuery): Объект callback запроса
+        callback_data (ReferenceCallback): Данные выбранной категории
+        session (AsyncSession): Сессия базы данных
 
     [EN]
     Shows work examples for selected category.
 
+    Photos are sent through the file_id cache, so files
+    are uploaded to Telegram only once.
+
     Args:
         callback (CallbackQuery): Callback query object
+        callback_data (ReferenceCallback): Selected category data
+        session (AsyncSession): Database session
     """
-    directory = None
-
-    if callback.data == "🚗 Автомобили":
-        directory = 'auto'
-    elif callback.data == "💄 Бьюти-сфера":
-        directory = 'beauty'
-    elif callback.data == "🏗 Строительство":
-        directory = 'building'
-    elif callback.data == "🍕 Еда и товары":
-        directory = 'food'
-    elif callback.data == "🏭 Промышленность":
-        directory = 'industry'
-    elif callback.data == "🏠 Ремонтные работы":
-        directory = 'repair'
-    elif callback.data == "👨‍💻 Специалисты":
-        directory = 'specialist'
-    else:
+    category = categories.get(callback_data.category)
+    if not category:
+        await callback.answer()
         return
 
-    photo_paths = [Path('.', 'data', 'image', directory, f'{num}.PNG') for num in range(1, 5)]
-    media = [InputMediaPhoto(media=FSInputFile(path)) for path in photo_paths]
-    await callback.message.answer_media_group(media=media)
-
-    builder = InlineKeyboardBuilder()
-    for name in ['Назад', '🏠 Вернуться в главное меню']:
-        builder.button(text=name, callback_data=name)
-    builder.adjust(1)
+    await media_cache.send_media_group(callback.message, session, list(category.files))
 
-    await callback.message.answer(text=f'Примеры по теме {callback.data}', reply_markup=builder.as_markup())
+    await callback.message.answer(text=f'Примеры по теме {category.title}', reply_markup=reference_markup)
     await callback.message.delete()
 
 
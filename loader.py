@@ -12,7 +12,8 @@ Provides Config class for working with environment variables
 and getting bot token from .env file.
 """
 
-import os, dotenv
+import os, re, dotenv
+from typing import Optional
 
 
 class Config:
@@ -35,15 +36,72 @@ class Config:
         [RU]
         Инициализирует объект Config.
         
-        Загружает переменные окружения и сохраняет токен бота.
+        Загружает переменные окружения и сохраняет токен бота
+        и параметры работы бота.
 
         [EN]
         Initializes Config object.
         
-        Loads environment variables and stores bot token.
+        Loads environment variables and stores bot token
+        and bot settings.
         """
         dotenv.load_dotenv()
         self._token = os.getenv('BOT_TOKEN')
+        self._debug = os.getenv('DEBUG', '').lower() in ('1', 'true', 'yes')
+        self._admins_ttl = os.getenv('ADMINS_TTL')
+        self._questions_ttl = os.getenv('QUESTIONS_TTL')
+        self._workers = int(os.getenv('WORKERS') or os.cpu_count() or 1)
+        self._users_cache = {
+            'maxsize': int(os.getenv('USERS_CACHE_SIZE', 10_000)),
+            'ttl': float(os.getenv('USERS_CACHE_TTL', 600)),
+        }
+        self._leads_writer = {
+            'batch_size': int(os.getenv('LEADS_BATCH_SIZE', 100)),
+            'flush_interval': int(os.getenv('LEADS_FLUSH_MS', 500)) / 1000,
+        }
+        self._broadcast = {
+            'rate': float(os.getenv('BROADCAST_RATE', 25)),
+        }
+        self._api_session = {
+            'limit': int(os.getenv('API_POOL_LIMIT', 100)),
+            'limit_per_host': int(os.getenv('API_POOL_LIMIT_PER_HOST', 0)),
+            'keepalive_timeout': float(os.getenv('API_KEEPALIVE_TIMEOUT', 15)),
+            'timeout': float(os.getenv('API_TIMEOUT', 60)),
+        }
+        self._metrics = {
+            'host': os.getenv('METRICS_HOST', '127.0.0.1'),
+            'port': int(os.getenv('METRICS_PORT') or 0) or None,
+        }
+        self._log = {
+            'format': os.getenv('LOG_FORMAT', 'text'),
+            'level': os.getenv('LOG_LEVEL', 'INFO').upper(),
+            'slow_update_ms': float(os.getenv('LOG_SLOW_UPDATE_MS', 1000)),
+            'levels': dict(
+                (name.strip(), level.strip().upper())
+                for name, level in (item.split('=', 1) for item in os.getenv('LOG_LEVELS', '').split(',') if '=' in item)
+            ),
+        }
+        self._fsm_storage = os.getenv('FSM_STORAGE', 'sqlite')
+        self._run_mode = os.getenv('RUN_MODE', 'polling')
+        self._webhook = {
+            'url': os.getenv('WEBHOOK_URL'),
+            'path': os.getenv('WEBHOOK_PATH', '/webhook'),
+            'secret': os.getenv('WEBHOOK_SECRET'),
+            'host': os.getenv('WEBAPP_HOST', '127.0.0.1'),
+            'port': int(os.getenv('WEBAPP_PORT', 8080)),
+            'max_connections': int(os.getenv('WEBHOOK_MAX_CONNECTIONS', 40)),
+        }
+        self._db_path = os.getenv('DB_PATH', os.path.join('data', 'db.db'))
+        self._db_profile = {
+            'echo': os.getenv('DB_ECHO', '').lower() in ('1', 'true', 'yes'),
+            'journal_mode': os.getenv('DB_JOURNAL_MODE', 'WAL'),
+            'synchronous': os.getenv('DB_SYNCHRONOUS', 'NORMAL'),
+            'mmap_size': int(os.getenv('DB_MMAP_SIZE', 256 * 1024 * 1024)),
+            'cache_size': int(os.getenv('DB_CACHE_SIZE', -64 * 1024)),
+            'busy_timeout': int(os.getenv('DB_BUSY_TIMEOUT', 5000)),
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 5)),
+        }
 
     def get_token(self) -> str:
         """
@@ -60,3 +118,263 @@ class Config:
             str: Token for accessing Telegram Bot API.
         """
         return self._token
+
+    def get_debug(self) -> bool:
+        """
+        [RU]
+        Возвращает, включен ли режим отладочной трассировки.
+
+        Returns:
+            bool: True, если вызовы trace() выводят значения в лог.
+
+        [EN]
+        Returns whether debug tracing mode is enabled.
+
+        Returns:
+            bool: True if trace() calls output values to the log.
+        """
+        return self._debug
+
+    def get_admins_ttl(self) -> Optional[float]:
+        """
+        [RU]
+        Возвращает период повторной синхронизации списка администраторов.
+
+        Returns:
+            Optional[float]: Период в секундах или None, если синхронизация отключена.
+
+        [EN]
+        Returns admin list re-sync period.
+
+        Returns:
+            Optional[float]: Period in seconds or None if re-sync is disabled.
+        """
+        return float(self._admins_ttl) if self._admins_ttl else None
+
+    def get_questions_ttl(self) -> Optional[float]:
+        """
+        [RU]
+        Возвращает период повторной загрузки вопросов анкеты из базы данных.
+
+        Returns:
+            Optional[float]: Период в секундах или None, если перезагрузка отключена.
+
+        [EN]
+        Returns interview questions reload period.
+
+        Returns:
+            Optional[float]: Period in seconds or None if reload is disabled.
+        """
+        return float(self._questions_ttl) if self._questions_ttl else None
+
+    def get_workers(self) -> int:
+        """
+        [RU]
+        Возвращает количество процессов-обработчиков многопроцессного режима.
+
+        Returns:
+            int: Количество процессов, по умолчанию - количество ядер процессора.
+
+        [EN]
+        Returns the number of worker processes in multi-process mode.
+
+        Returns:
+            int: Number of processes, CPU core count by default.
+        """
+        return max(self._workers, 1)
+
+    def get_db_path(self) -> str:
+        """
+        [RU]
+        Возвращает путь к файлу базы данных SQLite.
+
+        Returns:
+            str: Путь к файлу базы данных, по умолчанию data/db.db.
+
+        [EN]
+        Returns SQLite database file path.
+
+        Returns:
+            str: Database file path, data/db.db by default.
+        """
+        return self._db_path
+
+    def get_users_cache_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры кэша пользователей.
+
+        Returns:
+            dict: Максимальный размер кэша и время жизни записи в секундах.
+
+        [EN]
+        Returns user cache settings.
+
+        Returns:
+            dict: Maximum cache size and entry lifetime in seconds.
+        """
+        return dict(self._users_cache)
+
+    def get_leads_writer_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры пакетной записи заявок.
+
+        Returns:
+            dict: Размер пакета и максимальная задержка записи в секундах.
+
+        [EN]
+        Returns batched application writing settings.
+
+        Returns:
+            dict: Batch size and maximum write delay in seconds.
+        """
+        return dict(self._leads_writer)
+
+    def get_broadcast_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры рассылок.
+
+        Returns:
+            dict: Лимит рассылок, сообщений в секунду.
+
+        [EN]
+        Returns broadcast settings.
+
+        Returns:
+            dict: Broadcast limit, messages per second.
+        """
+        return dict(self._broadcast)
+
+    def get_db_profile(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры подключения к базе данных SQLite.
+
+        Returns:
+            dict: Параметры движка и PRAGMA-настройки SQLite.
+
+        [EN]
+        Returns SQLite database connection settings.
+
+        Returns:
+            dict: Engine parameters and SQLite PRAGMA settings.
+        """
+        return dict(self._db_profile)
+
+    def get_fsm_storage(self) -> str:
+        """
+        [RU]
+        Возвращает тип хранилища состояний FSM.
+
+        Returns:
+            str: sqlite - состояния в базе данных, memory - в памяти процесса.
+
+        [EN]
+        Returns FSM storage type.
+
+        Returns:
+            str: sqlite - states in the database, memory - in process memory.
+        """
+        return self._fsm_storage
+
+    def get_run_mode(self) -> str:
+        """
+        [RU]
+        Возвращает режим получения обновлений.
+
+        Returns:
+            str: polling - long polling, webhook - веб-сервер для вебхука.
+
+        [EN]
+        Returns update receiving mode.
+
+        Returns:
+            str: polling - long polling, webhook - web server for webhook.
+        """
+        return self._run_mode
+
+    def get_webhook_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры вебхука и веб-сервера.
+
+        Returns:
+            dict: Внешний URL, путь, секретный токен, адрес и порт сервера,
+                максимальное количество соединений.
+
+        Raises:
+            ValueError: WEBHOOK_SECRET не задан или содержит недопустимые символы.
+                Без секрета вебхук принимал бы поддельные обновления от кого угодно.
+
+        [EN]
+        Returns webhook and web server settings.
+
+        Returns:
+            dict: External URL, path, secret token, server host and port,
+                maximum number of connections.
+
+        Raises:
+            ValueError: WEBHOOK_SECRET is not set or contains invalid characters.
+                Without a secret the webhook would accept forged updates from anyone.
+        """
+        if not re.fullmatch(r'[A-Za-z0-9_-]{1,256}', self._webhook['secret'] or ''):
+            raise ValueError(
+                'Для RUN_MODE=webhook задайте WEBHOOK_SECRET: 1-256 символов A-Z, a-z, 0-9, _ и -'
+            )
+        return dict(self._webhook)
+
+    def get_log_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры логирования.
+
+        Returns:
+            dict: Формат (text или json), общий уровень, уровни отдельных
+                логгеров из LOG_LEVELS вида "sqlalchemy.engine=INFO,aiogram.event=WARNING"
+                и порог медленного обновления, мс.
+
+        [EN]
+        Returns logging settings.
+
+        Returns:
+            dict: Format (text or json), root level, per-logger levels from
+                LOG_LEVELS like "sqlalchemy.engine=INFO,aiogram.event=WARNING"
+                and the slow update threshold, ms.
+        """
+        return {**self._log, 'levels': dict(self._log['levels'])}
+
+    def get_metrics_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры HTTP-сервера метрик.
+
+        Returns:
+            dict: Адрес и порт сервера. Порт None - сервер метрик отключен.
+
+        [EN]
+        Returns metrics HTTP server settings.
+
+        Returns:
+            dict: Server host and port. Port None - metrics server is disabled.
+        """
+        return dict(self._metrics)
+
+    def get_api_session_settings(self) -> dict:
+        """
+        [RU]
+        Возвращает параметры HTTP-сессии для запросов к Telegram Bot API.
+
+        Returns:
+            dict: Размер пула соединений (общий и на хост), время жизни
+                неактивного соединения и таймаут запроса в секундах.
+
+        [EN]
+        Returns HTTP session settings for Telegram Bot API requests.
+
+        Returns:
+            dict: Connection pool size (total and per host), idle connection
+                lifetime and request timeout in seconds.
+        """
+        return dict(self._api_session)
@@ -14,89 +14,251 @@ and connects all necessary components (routers, middleware).
 
 import asyncio
 import logging
-import os
-from logging import StreamHandler
-from logging.handlers import TimedRotatingFileHandler
-from pathlib import Path
+import signal
 
 from data import database
+from data.references import categories
+from data.storage import SQLiteStorage
+from filters.admin_filter import admins
 
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
 from loader import Config
 from handlers import router
 from aiogram import Bot, Dispatcher
 
-from middlewares import DatabaseMiddleware
+from middlewares import DatabaseMiddleware, LogContextMiddleware, HandlerNameMiddleware
+from middlewares.metrics import MetricsMiddleware, HandlerMetricsMiddleware, track_sessions
+from utils.metrics import metrics_server
+from utils.session import InstrumentedSession
+from utils.log import setup_logging, shutdown_logging
+from utils.broadcast import broadcaster
+from utils.leads import lead_writer
+from utils.outbox import outbox
 
-dp = Dispatcher()
+dp = Dispatcher(storage=SQLiteStorage() if Config().get_fsm_storage() == 'sqlite' else MemoryStorage())
 
-async def on_startup():
+async def on_startup(bot: Bot, primary: bool = True, worker: int = 0):
     """
     [RU]
     Функция, выполняемая при запуске бота.
     
-    Создает директорию для логов если она не существует и настраивает систему логирования.
-    Также инициализирует базу данных.
+    Инициализирует базу данных, реестр администраторов
+    и реестр категорий примеров работ, запускает запись заявок,
+    доставку сообщений из очереди, рассылки и сервер метрик.
+
+    Args:
+        bot (Bot): Объект бота
+        primary (bool): Основной ли это процесс. В многопроцессном режиме
+            база данных создается, а очередь сообщений и рассылки
+            обрабатываются только в основном процессе.
+        worker (int): Номер процесса-обработчика, добавляется к порту метрик
 
     [EN]
     Function executed when the bot starts.
     
-    Creates a log directory if it doesn't exist and configures the logging system.
-    Also initializes the database.
+    Initializes the database, the admin registry
+    and the work examples category registry, starts application writing,
+    queued message delivery, broadcasts and the metrics server.
+
+    Args:
+        bot (Bot): Bot object
+        primary (bool): Whether this is the primary process. In multi-process
+            mode the database is created and the message queue and broadcasts
+            are processed only in the primary process.
+        worker (int): Worker process number, added to the metrics port
     """
-    log_dir = Path('logs')
-    if not log_dir.exists():
-        log_dir.mkdir()
+    if primary:
+        await database.create_database()
+    await admins.load()
+    categories.load()
+    lead_writer.start()
+    if primary:
+        outbox.start(bot)
+        broadcaster.start(bot)
 
+    metrics = Config().get_metrics_settings()
+    if metrics['port']:
+        await metrics_server.start(metrics['host'], metrics['port'] + worker)
 
-    handler = TimedRotatingFileHandler(
-        filename=os.path.join(log_dir, 'bot'),
-        when='midnight',  # 'midnight',
-        interval=1,
-        backupCount=7,
-        encoding='utf-8'
-    )
-    handler.suffix = "%Y-%m-%d_%H-%M-%S"
-    handler.namer = lambda x: x + '.log'
-
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-        handlers=[
-            handler, StreamHandler()
-        ]
-    )
 
-    await database.create_database()
+async def on_shutdown():
+    """
+    [RU]
+    Функция, выполняемая при остановке бота.
 
+    Записывает оставшиеся заявки, останавливает рассылки, доставку
+    сообщений из очереди и сервер метрик.
 
-async def main():
+    [EN]
+    Function executed when the bot stops.
+
+    Writes the remaining applications, stops broadcasts, queued message
+    delivery and the metrics server.
+    """
+    await lead_writer.stop()
+    await broadcaster.stop()
+    await outbox.stop()
+    await metrics_server.stop()
+
+
+def create_bot() -> Bot:
     """
     [RU]
-    Основная функция запуска бота.
-    
-    Регистрирует обработчик запуска, инициализирует бота с настройками,
-    подключает middleware и роутеры, запускает поллинг обновлений.
+    Создает объект бота с настройками по умолчанию
+    и сессией, собирающей метрики запросов к Telegram Bot API.
+
+    Returns:
+        Bot: Объект бота
 
     [EN]
-    Main bot launch function.
-    
-    Registers startup handler, initializes bot with settings,
-    connects middleware and routers, starts update polling.
-    """
-    dp.startup.register(on_startup)
+    Creates a bot object with default settings
+    and a session collecting Telegram Bot API request metrics.
 
+    Returns:
+        Bot: Bot object
+    """
     bot = Bot(
         token=Config().get_token(),
+        session=InstrumentedSession(**Config().get_api_session_settings()),
     )
     bot.default = DefaultBotProperties(parse_mode=ParseMode.HTML)
+    return bot
 
-    dp.update.outer_middleware(DatabaseMiddleware())
+
+def setup_dispatcher():
+    """
+    [RU]
+    Регистрирует обработчики запуска и остановки, подключает middleware и роутеры.
+
+    [EN]
+    Registers startup and shutdown handlers, connects middleware and routers.
+    """
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+
+    database_middleware = DatabaseMiddleware()
+    track_sessions(database_middleware.stats)
+
+    dp.update.outer_middleware(LogContextMiddleware(Config().get_log_settings()['slow_update_ms']))
+    dp.update.outer_middleware(MetricsMiddleware())
+    dp.update.outer_middleware(database_middleware)
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(HandlerNameMiddleware())
+        observer.middleware(HandlerMetricsMiddleware())
     dp.include_router(router)
+
+
+async def run_polling(bot: Bot):
+    """
+    [RU]
+    Запускает получение обновлений через long polling.
+
+    Args:
+        bot (Bot): Объект бота
+
+    [EN]
+    Starts receiving updates via long polling.
+
+    Args:
+        bot (Bot): Bot object
+    """
+    # Long polling не работает при установленном вебхуке / Long polling fails while a webhook is set
+    await bot.delete_webhook()
     await dp.start_polling(bot)
 
 
+async def run_webhook(bot: Bot):
+    """
+    [RU]
+    Запускает веб-сервер aiohttp для получения обновлений через вебхук.
+
+    Устанавливает вебхук с секретным токеном, который проверяется
+    у каждого входящего запроса. Без WEBHOOK_SECRET не запускается.
+    Останавливается по SIGINT/SIGTERM, корректно завершая работу диспетчера.
+
+    Args:
+        bot (Bot): Объект бота
+
+    [EN]
+    Starts an aiohttp web server for receiving updates via webhook.
+
+    Sets the webhook with a secret token that is checked on every
+    incoming request. Does not start without WEBHOOK_SECRET.
+    Stops on SIGINT/SIGTERM, shutting the dispatcher down cleanly.
+
+    Args:
+        bot (Bot): Bot object
+    """
+    settings = Config().get_webhook_settings()
+
+    async def set_webhook():
+        await bot.set_webhook(
+            url=settings['url'].rstrip('/') + settings['path'],
+            secret_token=settings['secret'],
+            max_connections=settings['max_connections'],
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+
+    dp.startup.register(set_webhook)
+
+    app = web.Application()
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=settings['secret']).register(app, path=settings['path'])
+    setup_application(app, dp, bot=bot)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host=settings['host'], port=settings['port']).start()
+        logging.info(f"Вебхук слушает {settings['host']}:{settings['port']}{settings['path']}")
+        await stop.wait()
+    finally:
+        await runner.cleanup()
+        await bot.session.close()
+
+
+async def main():
+    """
+    [RU]
+    Основная функция запуска бота.
+    
+    Настраивает логирование, регистрирует обработчики запуска и остановки,
+    инициализирует бота с настройками,
+    подключает middleware и роутеры, запускает получение обновлений
+    в режиме из конфигурации (long polling или вебхук).
+
+    [EN]
+    Main bot launch function.
+    
+    Configures logging, registers startup and shutdown handlers,
+    initializes bot with settings,
+    connects middleware and routers, starts receiving updates
+    in the configured mode (long polling or webhook).
+    """
+    setup_logging()
+    try:
+        setup_dispatcher()
+        bot = create_bot()
+
+        if Config().get_run_mode() == 'webhook':
+            await run_webhook(bot)
+        else:
+            await run_polling(bot)
+    finally:
+        shutdown_logging()
+
+
 if __name__ == '__main__':
     asyncio.run(main())
@@ -1 +1,2 @@
-from .connect import DatabaseMiddleware
\ No newline at end of file
+from .connect import DatabaseMiddleware
+from .log_context import LogContextMiddleware, HandlerNameMiddleware
\ No newline at end of file
@@ -12,14 +12,36 @@ Provides middleware for automatic database session management
 in bot event handlers.
 """
 
-__all__ = ('DatabaseMiddleware', )
+__all__ = ('DatabaseMiddleware', 'SessionStats')
 
+import logging
+from dataclasses import dataclass
 from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from data.database import get_session, get_db
+from data.database import LazySession
+
+
+@dataclass(slots=True)
+class SessionStats:
+    """
+    [RU]
+    Счетчики открытых и пропущенных сессий базы данных.
+
+    Attributes:
+        opened (int): Количество обновлений, открывших сессию
+        skipped (int): Количество обновлений, обошедшихся без сессии
+
+    [EN]
+    Counters of opened and skipped database sessions.
+
+    Attributes:
+        opened (int): Number of updates that opened a session
+        skipped (int): Number of updates that did without a session
+    """
+    opened: int = 0
+    skipped: int = 0
 
 
 class DatabaseMiddleware(BaseMiddleware):
@@ -27,18 +49,21 @@ class DatabaseMiddleware(BaseMiddleware):
     [RU]
     Middleware для управления соединением с базой данных.
 
-    Автоматически создает сессию базы данных для каждого обработчика
-    и закрывает её после завершения обработки. Добавляет объект сессии
-    в данные обработчика под ключом "session".
+    Передает в данные обработчика под ключом "session" ленивую сессию
+    базы данных, которая открывается только при первом использовании.
+    Ведет счетчики открытых и пропущенных сессий.
 
     [EN]
     Middleware for database connection management.
 
-    Automatically creates database session for each handler
-    and closes it after processing is complete. Adds session object
-    to handler data under "session" key.
+    Passes a lazy database session to handler data under "session" key,
+    which is opened only on first use. Keeps counters of opened
+    and skipped sessions.
     """
 
+    def __init__(self):
+        self.stats = SessionStats()
+
     async def __call__(
             self,
             handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
@@ -69,6 +94,14 @@ class DatabaseMiddleware(BaseMiddleware):
             Any: Handler execution result
         """
 
-        async with get_db() as session:
-            data["session"] = session
-            return await handler(event, data)
\ No newline at end of file
+        session = LazySession()
+        try:
+            async with session:
+                data["session"] = session
+                return await handler(event, data)
+        finally:
+            if session.is_opened:
+                self.stats.opened += 1
+            else:
+                self.stats.skipped += 1
+            logging.debug(f"Сессии БД: открыто {self.stats.opened}, пропущено {self.stats.skipped}")
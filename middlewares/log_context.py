@@ -0,0 +1,96 @@
+"""
+[RU]
+Модуль контекста логирования обновлений.
+
+Предоставляет middleware, добавляющие к записям логов ID обновления
+и имя обработчика. Время обработки записывается на уровне DEBUG,
+а медленные обновления - на уровне WARNING.
+
+[EN]
+Update logging context module.
+
+Provides middleware adding the update ID and handler name to log
+records. The processing time is logged at DEBUG, and slow updates
+at WARNING.
+"""
+
+__all__ = ('LogContextMiddleware', 'HandlerNameMiddleware')
+
+import logging
+import time
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from utils import log
+
+
+class LogContextMiddleware(BaseMiddleware):
+    """
+    [RU]
+    Внешний middleware обновлений.
+
+    Привязывает ID обновления ко всем записям логов, сделанным при его
+    обработке, и записывает время обработки в поле latency (мс): на уровне
+    DEBUG или WARNING, если обработка заняла не меньше slow_update_ms.
+
+    [EN]
+    Outer update middleware.
+
+    Binds the update ID to all log records made while processing it
+    and logs the processing time in the latency field (ms): at DEBUG,
+    or at WARNING if processing took at least slow_update_ms.
+    """
+
+    def __init__(self, slow_update_ms: float = 1000):
+        """
+        [RU]
+        Args:
+            slow_update_ms (float): Время обработки, начиная с которого обновление считается медленным, мс
+
+        [EN]
+        Args:
+            slow_update_ms (float): Processing time from which an update is considered slow, ms
+        """
+        self.slow_update_ms = slow_update_ms
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: Update,
+            data: Dict[str, Any]
+    ) -> Any:
+        token = log.bind(update_id=event.update_id)
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            latency = round((time.perf_counter() - start) * 1000, 1)
+            level = logging.WARNING if latency >= self.slow_update_ms else logging.DEBUG
+            logging.log(level, f"Обновление {event.update_id} обработано за {latency} мс", extra={'latency': latency})
+            log.reset(token)
+
+
+class HandlerNameMiddleware(BaseMiddleware):
+    """
+    [RU]
+    Внутренний middleware событий.
+
+    Добавляет к записям логов имя выбранного обработчика.
+
+    [EN]
+    Inner event middleware.
+
+    Adds the selected handler name to log records.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        # Поле не сбрасывается, чтобы попасть в итоговую запись LogContextMiddleware
+        # The field is not reset so that it reaches the LogContextMiddleware summary record
+        log.bind(handler=data['handler'].callback.__qualname__)
+        return await handler(event, data)
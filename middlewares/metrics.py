@@ -0,0 +1,123 @@
+"""
+[RU]
+Модуль сбора метрик обработки обновлений.
+
+Предоставляет middleware, измеряющие время обработки обновлений
+и отдельных обработчиков и считающие ошибки. Метрики запросов
+к Telegram Bot API собирает сессия бота (utils.session).
+
+[EN]
+Update processing metrics module.
+
+Provides middleware measuring the processing time of updates and of
+individual handlers and counting errors. Telegram Bot API request
+metrics are collected by the bot session (utils.session).
+"""
+
+__all__ = ('MetricsMiddleware', 'HandlerMetricsMiddleware', 'track_sessions')
+
+import time
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from middlewares.connect import SessionStats
+from utils.metrics import registry
+
+updates_total = registry.counter(
+    'bot_updates_total', 'Processed updates', ('type',))
+update_errors_total = registry.counter(
+    'bot_update_errors_total', 'Updates that raised an exception', ('type',))
+update_latency = registry.histogram(
+    'bot_update_latency_seconds', 'Update processing time', ('type',))
+handler_latency = registry.histogram(
+    'bot_handler_latency_seconds', 'Handler execution time', ('router', 'handler'))
+handler_errors_total = registry.counter(
+    'bot_handler_errors_total', 'Handler calls that raised an exception', ('router', 'handler'))
+
+
+def track_sessions(stats: SessionStats):
+    """
+    [RU]
+    Регистрирует метрику открытых и пропущенных сессий базы данных.
+
+    Args:
+        stats (SessionStats): Счетчики DatabaseMiddleware
+
+    [EN]
+    Registers the opened and skipped database sessions metric.
+
+    Args:
+        stats (SessionStats): DatabaseMiddleware counters
+    """
+    registry.collector(
+        'bot_db_sessions_total', 'Updates by whether a database session was opened',
+        lambda: {('opened',): stats.opened, ('skipped',): stats.skipped},
+        kind='counter', labels=('result',)
+    )
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    [RU]
+    Внешний middleware обновлений.
+
+    Считает обновления и ошибки по типу обновления
+    и измеряет полное время их обработки.
+
+    [EN]
+    Outer update middleware.
+
+    Counts updates and errors by update type
+    and measures their full processing time.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: Update,
+            data: Dict[str, Any]
+    ) -> Any:
+        update_type = event.event_type
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            update_errors_total.inc(update_type)
+            raise
+        finally:
+            updates_total.inc(update_type)
+            update_latency.observe(time.perf_counter() - start, update_type)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    [RU]
+    Внутренний middleware событий.
+
+    Измеряет время выполнения и считает ошибки выбранного обработчика
+    с метками роутера и обработчика.
+
+    [EN]
+    Inner event middleware.
+
+    Measures execution time and counts errors of the selected handler
+    labelled by router and handler.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        labels = (data['event_router'].name, data['handler'].callback.__qualname__)
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            handler_errors_total.inc(*labels)
+            raise
+        finally:
+            handler_latency.observe(time.perf_counter() - start, *labels)
+
@@ -1 +1 @@
-from . import user_states
\ No newline at end of file
+from . import user_states, snapshot
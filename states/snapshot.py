@@ -0,0 +1,146 @@
+"""
+[RU]
+Модуль снимка состояния FSM на время обработки обновления.
+
+Снимок один раз читает данные состояния, позволяет обработчику
+изменять их локально и записывает все изменения одним вызовом
+при выходе из контекста.
+
+[EN]
+FSM state snapshot module for the duration of an update.
+
+The snapshot reads state data once, lets the handler change it
+locally and writes all changes in a single call on context exit.
+"""
+
+__all__ = ('StateSnapshot', )
+
+from contextvars import ContextVar
+from copy import copy
+from typing import Any, Optional
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType
+
+_active: ContextVar[Optional['StateSnapshot']] = ContextVar('state_snapshot', default=None)
+
+
+class StateSnapshot:
+    """
+    [RU]
+    Снимок состояния FSM.
+
+    Используется как асинхронный контекстный менеджер. Вложенные снимки
+    того же состояния (например, при вызове одного обработчика из другого)
+    используют внешний снимок, а запись выполняется только при выходе
+    из внешнего.
+
+    [EN]
+    FSM state snapshot.
+
+    Used as an async context manager. Nested snapshots of the same state
+    (e.g. when one handler calls another) reuse the outer snapshot, and
+    the write happens only on exiting the outer one.
+    """
+
+    def __init__(self, state: FSMContext):
+        """
+        [RU]
+        Args:
+            state (FSMContext): Контекст состояния FSM
+
+        [EN]
+        Args:
+            state (FSMContext): FSM state context
+        """
+        self.context = state
+        self.data: dict[str, Any] = {}
+        self._state: StateType = None
+        self._state_changed = False
+        self._data_changed = False
+        self._root: Optional[StateSnapshot] = None
+
+    async def __aenter__(self) -> 'StateSnapshot':
+        parent = _active.get()
+        if parent is not None and parent.context.key == self.context.key:
+            self._root = parent
+            return parent
+
+        self.data = await self.context.get_data()
+        self._token = _active.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._root is not None:
+            return
+
+        _active.reset(self._token)
+        if self._state_changed:
+            await self.context.set_state(self._state)
+        if self._data_changed:
+            await self.context.set_data(self.data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        [RU]
+        Возвращает значение из данных состояния.
+
+        Args:
+            key (str): Ключ
+            default (Any): Значение по умолчанию
+
+        Returns:
+            Any: Копия значения
+
+        [EN]
+        Returns a value from state data.
+
+        Args:
+            key (str): Key
+            default (Any): Default value
+
+        Returns:
+            Any: Value copy
+        """
+        return copy(self.data.get(key, default))
+
+    def update(self, **kwargs: Any):
+        """
+        [RU]
+        Обновляет данные состояния.
+
+        [EN]
+        Updates state data.
+        """
+        self.data.update(kwargs)
+        self._data_changed = True
+
+    def set_state(self, state: StateType = None):
+        """
+        [RU]
+        Устанавливает состояние.
+
+        Args:
+            state (StateType): Новое состояние
+
+        [EN]
+        Sets the state.
+
+        Args:
+            state (StateType): New state
+        """
+        self._state = state.state if isinstance(state, State) else state
+        self._state_changed = True
+
+    def clear(self):
+        """
+        [RU]
+        Сбрасывает состояние и данные.
+
+        [EN]
+        Resets state and data.
+        """
+        self.data = {}
+        self.set_state(None)
+        self._data_changed = True
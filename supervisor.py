@@ -0,0 +1,286 @@
+"""
+[RU]
+Многопроцессный режим запуска бота.
+
+Супервизор получает обновления (через long polling или вебхук) и
+распределяет их между несколькими процессами-обработчиками по хешу
+ID чата, поэтому все обновления одного чата, а значит и его состояние
+FSM, обрабатываются одним процессом. Процессы используют общую базу
+данных SQLite. Упавшие процессы перезапускаются.
+
+[EN]
+Multi-process bot launch mode.
+
+The supervisor receives updates (via long polling or webhook) and
+distributes them among several worker processes by chat ID hash, so
+all updates of one chat, and therefore its FSM state, are handled by
+one process. Workers share the SQLite database. Crashed workers are
+restarted.
+"""
+
+import asyncio
+import hmac
+import logging
+import multiprocessing
+import signal
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any, Optional
+
+from aiohttp import web
+
+from loader import Config
+from utils.log import setup_logging, shutdown_logging
+
+RESTART_CHECK_INTERVAL = 1
+POLLING_TIMEOUT = 30
+STOP_TIMEOUT = 10
+
+
+def update_chat_id(update: dict[str, Any]) -> int:
+    """
+    [RU]
+    Определяет ID чата обновления Telegram.
+
+    Если чата в обновлении нет (например, inline-запрос),
+    используется ID пользователя.
+
+    Args:
+        update (dict): Обновление Telegram в виде словаря
+
+    Returns:
+        int: ID чата, ID пользователя или 0
+
+    [EN]
+    Determines the chat ID of a Telegram update.
+
+    If the update has no chat (e.g. an inline query),
+    the user ID is used.
+
+    Args:
+        update (dict): Telegram update as a dict
+
+    Returns:
+        int: Chat ID, user ID or 0
+    """
+    for value in update.values():
+        if not isinstance(value, dict):
+            continue
+        chat = value.get('chat') or (value.get('message') or {}).get('chat')
+        if chat:
+            return chat['id']
+        user = value.get('from') or value.get('user')
+        if user:
+            return user['id']
+    return 0
+
+
+def worker_main(index: int, queue: Queue, log_queue: Queue):
+    """
+    [RU]
+    Точка входа процесса-обработчика.
+
+    Args:
+        index (int): Номер процесса, процесс 0 - основной
+        queue (Queue): Очередь обновлений процесса
+        log_queue (Queue): Очередь записей логов супервизора
+
+    [EN]
+    Worker process entry point.
+
+    Args:
+        index (int): Process number, process 0 is the primary one
+        queue (Queue): Process update queue
+        log_queue (Queue): Supervisor log record queue
+    """
+    # Остановкой управляет супервизор / Shutdown is driven by the supervisor
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_logging(log_queue, listen=False)
+    asyncio.run(_serve(index, queue))
+
+
+async def _serve(index: int, queue: Queue):
+    import main
+
+    main.setup_dispatcher()
+    bot = main.create_bot()
+    loop = asyncio.get_running_loop()
+    tasks: set[asyncio.Task] = set()
+
+    await main.dp.emit_startup(bot=bot, primary=index == 0, worker=index)
+    logging.info(f"Обработчик {index} запущен")
+    try:
+        while (update := await loop.run_in_executor(None, queue.get)) is not None:
+            task = asyncio.create_task(main.dp.feed_raw_update(bot, update))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+    finally:
+        await main.dp.emit_shutdown(bot=bot)
+        await bot.session.close()
+        logging.info(f"Обработчик {index} остановлен")
+
+
+class Supervisor:
+    """
+    [RU]
+    Супервизор процессов-обработчиков.
+
+    [EN]
+    Worker processes supervisor.
+    """
+
+    def __init__(self, workers: int):
+        """
+        [RU]
+        Args:
+            workers (int): Количество процессов-обработчиков
+
+        [EN]
+        Args:
+            workers (int): Number of worker processes
+        """
+        self._context = multiprocessing.get_context('spawn')
+        self._queues: list[Queue] = [self._context.Queue() for _ in range(workers)]
+        self._processes: list[Optional[BaseProcess]] = [None] * workers
+        self.log_queue: Queue = self._context.Queue()
+        self._stop = asyncio.Event()
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=worker_main, args=(index, self._queues[index], self.log_queue), name=f'bot-worker-{index}'
+        )
+        process.start()
+        self._processes[index] = process
+
+    def dispatch(self, update: dict[str, Any]):
+        """
+        [RU]
+        Передает обновление процессу, отвечающему за его чат.
+
+        Args:
+            update (dict): Обновление Telegram в виде словаря
+
+        [EN]
+        Passes an update to the process responsible for its chat.
+
+        Args:
+            update (dict): Telegram update as a dict
+        """
+        self._queues[update_chat_id(update) % len(self._queues)].put(update)
+
+    async def _watch(self):
+        while not self._stop.is_set():
+            for index, process in enumerate(self._processes):
+                if not process.is_alive():
+                    logging.error(f"Обработчик {index} завершился с кодом {process.exitcode}, перезапуск")
+                    self._spawn(index)
+            try:
+                await asyncio.wait_for(self._stop.wait(), RESTART_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, bot, allowed_updates: list[str]):
+        await bot.delete_webhook()
+        offset = None
+        while not self._stop.is_set():
+            try:
+                updates = await bot.get_updates(
+                    offset=offset, timeout=POLLING_TIMEOUT, allowed_updates=allowed_updates
+                )
+            except Exception as e:
+                logging.error(f"Ошибка при получении обновлений: {e}")
+                await asyncio.sleep(1)
+                continue
+            for update in updates:
+                self.dispatch(update.model_dump(mode='json', exclude_unset=True))
+                offset = update.update_id + 1
+
+    async def _webhook(self, bot, allowed_updates: list[str], settings: dict):
+        async def handle(request: web.Request) -> web.Response:
+            token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+            if not hmac.compare_digest(token.encode(), settings['secret'].encode()):
+                return web.Response(status=401, text='Unauthorized')
+            self.dispatch(await request.json())
+            return web.Response()
+
+        app = web.Application()
+        app.router.add_post(settings['path'], handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host=settings['host'], port=settings['port']).start()
+            await bot.set_webhook(
+                url=settings['url'].rstrip('/') + settings['path'],
+                secret_token=settings['secret'],
+                max_connections=settings['max_connections'],
+                allowed_updates=allowed_updates,
+            )
+            logging.info(f"Вебхук слушает {settings['host']}:{settings['port']}{settings['path']}")
+            await self._stop.wait()
+        finally:
+            await runner.cleanup()
+
+    async def run(self):
+        """
+        [RU]
+        Запускает процессы-обработчики и получение обновлений
+        до сигнала SIGINT/SIGTERM.
+
+        [EN]
+        Starts worker processes and update receiving
+        until SIGINT/SIGTERM.
+        """
+        import main
+        from data.database import create_database
+
+        # Настройки вебхука проверяются до запуска обработчиков
+        # Webhook settings are validated before workers are started
+        webhook = Config().get_webhook_settings() if Config().get_run_mode() == 'webhook' else None
+        await create_database()
+        main.setup_dispatcher()
+        allowed_updates = main.dp.resolve_used_update_types()
+        bot = main.create_bot()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stop.set)
+            except NotImplementedError:  # Windows
+                pass
+
+        for index in range(len(self._processes)):
+            self._spawn(index)
+        logging.info(f"Запущено обработчиков: {len(self._processes)}")
+
+        receive = self._webhook(bot, allowed_updates, webhook) if webhook else self._poll(bot, allowed_updates)
+        tasks = [asyncio.create_task(self._watch()), asyncio.create_task(receive)]
+        try:
+            await self._stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await bot.session.close()
+            await self._shutdown()
+
+    async def _shutdown(self):
+        for queue in self._queues:
+            queue.put(None)
+        for index, process in enumerate(self._processes):
+            await asyncio.to_thread(process.join, STOP_TIMEOUT)
+            if process.is_alive():
+                logging.error(f"Обработчик {index} не остановился, завершение")
+                process.terminate()
+
+
+if __name__ == '__main__':
+    supervisor = Supervisor(Config().get_workers())
+    # Записи логов всех процессов пишет поток супервизора
+    # Log records of all processes are written by the supervisor thread
+    setup_logging(supervisor.log_queue)
+    try:
+        asyncio.run(supervisor.run())
+    finally:
+        shutdown_logging()
@@ -0,0 +1 @@
+from . import throttling, mailing
@@ -0,0 +1,277 @@
+"""
+[RU]
+Модуль рассылки сообщений пользователям и группам.
+
+Администратор создает рассылку в таблице broadcasts, а фоновая задача
+обходит получателей страницами, отправляет сообщения небольшими пакетами
+через общий ограничитель частоты и после каждого пакета сохраняет прогресс.
+Отмена прерывает текущий пакет, даже если он ждет окончания RetryAfter.
+Прерванные рассылки продолжаются после перезапуска бота.
+
+Рассылка отправляет не быстрее BROADCAST_RATE сообщений в секунду,
+оставляя часть общего лимита Telegram для ответов пользователям.
+
+[EN]
+Module for broadcasting messages to users and groups.
+
+An admin creates a broadcast in the broadcasts table, and a background
+task traverses recipients page by page, sends messages in small batches
+through the shared rate limiter and saves progress after each batch.
+Cancellation interrupts the current batch even while it waits out
+RetryAfter. Interrupted broadcasts continue after the bot restarts.
+
+Broadcasts send no faster than BROADCAST_RATE messages per second,
+leaving part of the global Telegram limit for replies to users.
+"""
+
+__all__ = ('BroadcastEngine', 'broadcaster')
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+
+from data.database import (
+    Broadcast, get_db, count_recipients, get_recipients_page, get_due_broadcasts,
+    update_broadcast, disable_mailing,
+)
+from loader import Config
+from utils.mailing import send_message
+from utils.metrics import registry
+from utils.throttling import ScopedLimiter, limiter
+
+PAGE_SIZE = 100
+BATCH_SIZE = 10
+POLL_INTERVAL = 5
+CANCEL_CHECK_INTERVAL = 1
+STATUS_INTERVAL = 5
+
+broadcast_messages_total = registry.counter(
+    'bot_broadcast_messages_total', 'Broadcast messages by delivery result', ('result',))
+
+status_text = '📣 <b>Рассылка #{id}</b> ({audience})\n' + \
+              'Статус: {status}\n' + \
+              'Обработано: {processed} из {total}\n' + \
+              'Доставлено: {sent}\n' + \
+              'Ошибки: {failed}\n' + \
+              'Заблокировали бота: {blocked}\n' + \
+              'Скорость: {rate:.1f} сообщ./с'
+
+
+class BroadcastEngine:
+    """
+    [RU]
+    Фоновое выполнение рассылок.
+
+    Опрашивает таблицу broadcasts (сразу после notify или раз
+    в POLL_INTERVAL секунд) и запускает задачу для каждой ожидающей
+    или прерванной рассылки. Все рассылки делят один собственный лимит.
+
+    [EN]
+    Background broadcast execution.
+
+    Polls the broadcasts table (right after notify or every POLL_INTERVAL
+    seconds) and starts a task for every pending or interrupted broadcast.
+    All broadcasts share one own limit.
+    """
+
+    def __init__(self, rate: float):
+        """
+        [RU]
+        Args:
+            rate (float): Лимит рассылок, сообщений в секунду
+
+        [EN]
+        Args:
+            rate (float): Broadcast limit, messages per second
+        """
+        self.limiter = ScopedLimiter(limiter, rate)
+        self._bot: Optional[Bot] = None
+        self._wakeup = asyncio.Event()
+        self._poller: Optional[asyncio.Task] = None
+        self._running: dict[int, asyncio.Task] = {}
+
+    def start(self, bot: Bot):
+        """
+        [RU]
+        Запускает опрос рассылок.
+
+        Args:
+            bot (Bot): Объект бота
+
+        [EN]
+        Starts broadcast polling.
+
+        Args:
+            bot (Bot): Bot object
+        """
+        self._bot = bot
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        """
+        [RU]
+        Останавливает опрос и выполняемые рассылки. Их прогресс сохранен
+        в базе данных, и после перезапуска они продолжатся.
+
+        [EN]
+        Stops polling and running broadcasts. Their progress is saved
+        in the database, and they continue after restart.
+        """
+        tasks = [task for task in (self._poller, *self._running.values()) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._poller = None
+        self._running = {}
+
+    def notify(self):
+        """
+        [RU]
+        Сообщает о новой рассылке.
+
+        [EN]
+        Signals that a new broadcast was created.
+        """
+        self._wakeup.set()
+
+    async def _poll(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                async with get_db() as session:
+                    broadcasts = await get_due_broadcasts(session, set(self._running))
+                for broadcast in broadcasts:
+                    task = asyncio.create_task(self._run(broadcast))
+                    self._running[broadcast.id] = task
+                    task.add_done_callback(lambda _, broadcast_id=broadcast.id: self._running.pop(broadcast_id, None))
+            except Exception as e:
+                logging.error(f"Ошибка при чтении рассылок: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, broadcast: Broadcast):
+        try:
+            await self._send_all(broadcast)
+        except Exception as e:
+            logging.error(f"Рассылка {broadcast.id} прервана: {e}")
+
+    async def _send_all(self, broadcast: Broadcast):
+        if broadcast.status == 'pending':
+            async with get_db() as session:
+                broadcast.total = await count_recipients(session, broadcast.audience)
+                broadcast.status = 'running'
+                await update_broadcast(session, broadcast.id, status='running', total=broadcast.total)
+            logging.info(f"Рассылка {broadcast.id} запущена, получателей: {broadcast.total}")
+        else:
+            logging.info(f"Рассылка {broadcast.id} продолжена после {broadcast.checkpoint}")
+
+        cancelled = asyncio.Event()
+        watcher = asyncio.create_task(self._watch_cancel(broadcast.id, cancelled))
+        started = reported = time.monotonic()
+        processed = 0
+        try:
+            while not cancelled.is_set():
+                async with get_db() as session:
+                    page = await get_recipients_page(session, broadcast.audience, broadcast.checkpoint, PAGE_SIZE)
+                if not page:
+                    break
+
+                for index in range(0, len(page), BATCH_SIZE):
+                    # Пакет прерывается отменой, даже если ждет окончания RetryAfter
+                    # A batch is interrupted by cancellation even while waiting out RetryAfter
+                    batch = asyncio.ensure_future(self._send_batch(broadcast, page[index:index + BATCH_SIZE]))
+                    cancel = asyncio.ensure_future(cancelled.wait())
+                    await asyncio.wait((batch, cancel), return_when=asyncio.FIRST_COMPLETED)
+                    cancel.cancel()
+                    if not batch.done():
+                        batch.cancel()
+                        await asyncio.gather(batch, return_exceptions=True)
+                        break
+                    processed += batch.result()
+
+                    if time.monotonic() - reported >= STATUS_INTERVAL:
+                        reported = time.monotonic()
+                        await self._report(broadcast, 'выполняется', processed / (reported - started))
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+
+        broadcast.status = 'cancelled' if cancelled.is_set() else 'done'
+        async with get_db() as session:
+            await update_broadcast(session, broadcast.id, status=broadcast.status, finished_at=datetime.utcnow())
+        logging.info(f"Рассылка {broadcast.id} завершена ({broadcast.status}): доставлено {broadcast.sent}, "
+                     f"ошибок {broadcast.failed}, заблокировали {broadcast.blocked}")
+        await self._report(broadcast, 'отменена' if broadcast.status == 'cancelled' else 'завершена',
+                           processed / max(time.monotonic() - started, 1e-9))
+
+    async def _send_batch(self, broadcast: Broadcast, chat_ids: list[int]) -> int:
+        results = await asyncio.gather(
+            *(send_message(self._bot, chat_id, broadcast.text, limiter=self.limiter) for chat_id in chat_ids)
+        )
+        blocked = [result.chat_id for result in results if result.blocked]
+        sent = sum(result.ok for result in results)
+        failed = len(results) - sent - len(blocked)
+        broadcast.sent += sent
+        broadcast.blocked += len(blocked)
+        broadcast.failed += failed
+        broadcast.checkpoint = chat_ids[-1]
+
+        broadcast_messages_total.inc('sent', amount=sent)
+        broadcast_messages_total.inc('blocked', amount=len(blocked))
+        broadcast_messages_total.inc('failed', amount=failed)
+
+        async with get_db() as session:
+            if broadcast.audience == 'groups':
+                await disable_mailing(session, blocked)
+            await update_broadcast(
+                session, broadcast.id, checkpoint=broadcast.checkpoint,
+                sent=broadcast.sent, failed=broadcast.failed, blocked=broadcast.blocked,
+            )
+        return len(results)
+
+    @staticmethod
+    async def _watch_cancel(broadcast_id: int, cancelled: asyncio.Event):
+        # Статус читается из базы данных: отмена может прийти из другого процесса
+        # The status is read from the database: cancellation may come from another process
+        while True:
+            try:
+                async with get_db() as session:
+                    if (await session.get(Broadcast, broadcast_id)).status == 'cancelled':
+                        cancelled.set()
+                        return
+            except Exception as e:
+                logging.error(f"Ошибка при проверке статуса рассылки {broadcast_id}: {e}")
+            await asyncio.sleep(CANCEL_CHECK_INTERVAL)
+
+    async def _report(self, broadcast: Broadcast, status: str, rate: float):
+        if not broadcast.chat_id or not broadcast.message_id:
+            return
+        try:
+            await self._bot.edit_message_text(
+                text=status_text.format(
+                    id=broadcast.id,
+                    audience=broadcast.audience,
+                    status=status,
+                    processed=broadcast.sent + broadcast.failed + broadcast.blocked,
+                    total=broadcast.total,
+                    sent=broadcast.sent,
+                    failed=broadcast.failed,
+                    blocked=broadcast.blocked,
+                    rate=rate,
+                ),
+                chat_id=broadcast.chat_id,
+                message_id=broadcast.message_id,
+            )
+        except TelegramAPIError as e:
+            logging.warning(f"Не удалось обновить статус рассылки {broadcast.id}: {e}")
+
+
+broadcaster = BroadcastEngine(**Config().get_broadcast_settings())
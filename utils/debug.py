@@ -0,0 +1,45 @@
+"""
+[RU]
+Модуль отладочной трассировки.
+
+При выключенном режиме отладки (DEBUG) trace - функция, которая
+только возвращает переданный аргумент, без анализа исходного кода
+и стека вызовов. При включенном режиме trace - отладчик icecream,
+который пишет в логгер "trace" с указанием места вызова.
+
+[EN]
+Debug tracing module.
+
+With debug mode (DEBUG) disabled, trace is a function that only
+returns its argument, without source or call stack inspection.
+With debug mode enabled, trace is an icecream debugger writing
+to the "trace" logger with the call location.
+"""
+
+__all__ = ('trace',)
+
+import logging
+from typing import Any
+
+from loader import Config
+
+
+def _passthrough(*args: Any) -> Any:
+    if not args:
+        return None
+    return args[0] if len(args) == 1 else args
+
+
+def _debugger():
+    # icecream импортируется только в режиме отладки
+    # icecream is only imported in debug mode
+    from icecream import IceCreamDebugger
+
+    logger = logging.getLogger('trace')
+    logger.setLevel(logging.DEBUG)
+    return IceCreamDebugger(prefix='', outputFunction=logger.debug, includeContext=True)
+
+
+# Выбор делается один раз при импорте, вызов не проверяет флаг
+# The choice is made once at import, a call does not check the flag
+trace = _debugger() if Config().get_debug() else _passthrough
@@ -0,0 +1,132 @@
+"""
+[RU]
+Модуль выгрузки пользователей и заявок в файлы.
+
+Записи читаются из базы данных порциями и сразу записываются
+в сжатый gzip файл CSV или JSONL, поэтому потребление памяти
+не зависит от размера таблицы. Сжатие выполняется в отдельном потоке,
+чтобы не блокировать обработку обновлений.
+
+[EN]
+Users and applications export module.
+
+Records are read from the database in chunks and immediately written
+to a gzip-compressed CSV or JSONL file, so memory usage does not depend
+on the table size. Compression runs in a separate thread so that
+update processing is not blocked.
+"""
+
+__all__ = ('TABLES', 'FORMATS', 'export')
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from data.database import Lead, User, get_db, stream_leads, stream_users
+
+CHUNK_SIZE = 1000
+
+FIELDS = {
+    'users': ('id', 'username', 'name', 'created_at'),
+    'leads': ('id', 'user_id', 'username', 'name', 'phone', 'created_at', 'answers'),
+}
+
+
+def user_row(user: User) -> dict:
+    return {
+        'id': user.id,
+        'username': user.username,
+        'name': user.name,
+        'created_at': user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+def lead_row(lead: Lead) -> dict:
+    return {
+        'id': lead.id,
+        'user_id': lead.user_id,
+        'username': lead.username,
+        'name': lead.name,
+        'phone': lead.phone,
+        'created_at': lead.created_at.isoformat() if lead.created_at else None,
+        'answers': [{'question': answer.question, 'answer': answer.answer} for answer in lead.answers],
+    }
+
+
+TABLES = {
+    'users': (stream_users, user_row),
+    'leads': (stream_leads, lead_row),
+}
+
+
+def encode_csv(rows: list[dict], fields: tuple[str, ...], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fields)
+    if header:
+        writer.writeheader()
+    for row in rows:
+        if isinstance(row.get('answers'), list):
+            row['answers'] = json.dumps(row['answers'], ensure_ascii=False)
+        writer.writerow(row)
+    return buffer.getvalue()
+
+
+def encode_jsonl(rows: list[dict], fields: tuple[str, ...], header: bool) -> str:
+    return ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+
+FORMATS = {
+    'csv': encode_csv,
+    'jsonl': encode_jsonl,
+}
+
+
+async def export(table: str, file_format: str) -> tuple[str, int]:
+    """
+    [RU]
+    Выгружает таблицу во временный сжатый файл.
+
+    Файл нужно удалить после использования.
+
+    Args:
+        table (str): Таблица: users или leads
+        file_format (str): Формат: csv или jsonl
+
+    Returns:
+        tuple[str, int]: Путь к файлу и количество выгруженных записей
+
+    [EN]
+    Exports a table to a temporary compressed file.
+
+    The file must be removed after use.
+
+    Args:
+        table (str): Table: users or leads
+        file_format (str): Format: csv or jsonl
+
+    Returns:
+        tuple[str, int]: File path and number of exported records
+    """
+    stream, to_row = TABLES[table]
+    encode = FORMATS[file_format]
+    fields = FIELDS[table]
+
+    descriptor, path = tempfile.mkstemp(prefix=f'{table}-', suffix=f'.{file_format}.gz')
+    count = 0
+    try:
+        with os.fdopen(descriptor, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8', newline='') as file:
+            async with get_db() as session:
+                async for chunk in stream(session, CHUNK_SIZE):
+                    data = encode([to_row(record) for record in chunk], fields, header=count == 0)
+                    count += len(chunk)
+                    await asyncio.to_thread(file.write, data)
+            if count == 0:
+                await asyncio.to_thread(file.write, encode([], fields, header=True))
+    except Exception:
+        os.remove(path)
+        raise
+    return path, count
@@ -0,0 +1,189 @@
+"""
+[RU]
+Модуль пакетной записи заявок в базу данных.
+
+Обработчики только добавляют заявку в буфер, а фоновая задача
+записывает накопленные заявки одной транзакцией, когда их набирается
+batch_size или проходит flush_interval секунд.
+
+[EN]
+Batched application writing module.
+
+Handlers only add an application to the buffer, and a background task
+writes the buffered applications in a single transaction once
+batch_size of them accumulate or flush_interval seconds pass.
+"""
+
+__all__ = ('LeadWriter', 'lead_writer')
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from data.database import Lead, LeadAnswer, get_db, save_leads
+from loader import Config
+from utils.metrics import registry
+
+leads_written_total = registry.counter(
+    'bot_leads_written_total', 'Applications written to the database')
+lead_flush_errors_total = registry.counter(
+    'bot_lead_flush_errors_total', 'Failed application batch writes')
+lead_flush_latency = registry.histogram(
+    'bot_lead_flush_latency_seconds', 'Application batch write time')
+
+
+class LeadWriter:
+    """
+    [RU]
+    Буфер заявок с фоновой пакетной записью.
+
+    Если запись пакета не удалась, заявки возвращаются в буфер
+    и записываются при следующей попытке.
+
+    [EN]
+    Application buffer with background batched writing.
+
+    If a batch write fails, the applications are returned to the
+    buffer and written on the next attempt.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 0.5):
+        """
+        [RU]
+        Args:
+            batch_size (int): Количество заявок, при котором буфер записывается сразу
+            flush_interval (float): Максимальное время ожидания записи, сек
+
+        [EN]
+        Args:
+            batch_size (int): Number of applications that triggers an immediate write
+            flush_interval (float): Maximum write delay, s
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._leads: list[Lead] = []
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, user_id: int, username: Optional[str], name: Optional[str], phone: Optional[str],
+            answers: dict[str, str]):
+        """
+        [RU]
+        Добавляет заявку в буфер записи.
+
+        Args:
+            user_id (int): Telegram ID пользователя
+            username (Optional[str]): Username пользователя в Telegram
+            name (Optional[str]): Имя пользователя
+            phone (Optional[str]): Номер телефона
+            answers (dict[str, str]): Ответы на вопросы анкеты в порядке прохождения
+
+        [EN]
+        Adds an application to the write buffer.
+
+        Args:
+            user_id (int): Telegram user ID
+            username (Optional[str]): User's Telegram username
+            name (Optional[str]): User name
+            phone (Optional[str]): Phone number
+            answers (dict[str, str]): Questionnaire answers in the order given
+        """
+        self._leads.append(Lead(
+            user_id=user_id,
+            username=username,
+            name=name,
+            phone=phone,
+            answers=[
+                LeadAnswer(position=position, question=question, answer=answer)
+                for position, (question, answer) in enumerate(answers.items())
+            ],
+        ))
+        if len(self._leads) >= self.batch_size:
+            self._full.set()
+
+    def start(self):
+        """
+        [RU]
+        Запускает фоновую запись буфера.
+
+        [EN]
+        Starts background buffer writing.
+        """
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        [RU]
+        Останавливает фоновую запись и записывает оставшиеся заявки.
+
+        Фоновая задача не отменяется, а завершается после текущей
+        записи, чтобы не прервать ее на середине.
+
+        [EN]
+        Stops background writing and writes the remaining applications.
+
+        The background task is not cancelled but exits after the current
+        write so that the write is not interrupted midway.
+        """
+        try:
+            if self._task:
+                self._stopping.set()
+                self._full.set()
+                await self._task
+                self._task = None
+            await self.flush()
+        finally:
+            if self._leads:
+                logging.error(f"Не записано заявок при остановке: {len(self._leads)}")
+
+    async def flush(self):
+        """
+        [RU]
+        Записывает все заявки из буфера одной транзакцией.
+
+        Если запись не удалась или была отменена, заявки возвращаются в буфер.
+
+        [EN]
+        Writes all buffered applications in a single transaction.
+
+        If the write fails or is cancelled, the applications are returned
+        to the buffer.
+        """
+        async with self._lock:
+            leads, self._leads = self._leads, []
+            self._full.clear()
+            if not leads:
+                return
+
+            written = False
+            start = time.perf_counter()
+            try:
+                async with get_db() as session:
+                    await save_leads(session, leads)
+                written = True
+            except Exception as e:
+                lead_flush_errors_total.inc()
+                logging.error(f"Ошибка при записи заявок ({len(leads)}): {e}")
+            finally:
+                lead_flush_latency.observe(time.perf_counter() - start)
+                # Отмена (CancelledError) тоже возвращает заявки в буфер
+                # Cancellation (CancelledError) also returns the applications to the buffer
+                if not written:
+                    self._leads[:0] = leads
+            if written:
+                leads_written_total.inc(amount=len(leads))
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+lead_writer = LeadWriter(**Config().get_leads_writer_settings())
@@ -0,0 +1,186 @@
+"""
+[RU]
+Модуль настройки логирования.
+
+Корневой логгер получает только QueueHandler, который кладет записи
+в очередь без обращения к диску. Запись в файл и вывод в консоль
+выполняет QueueListener в отдельном потоке, поэтому ротация логов
+и медленный диск не блокируют цикл событий. Записи дополняются
+полями обрабатываемого обновления (update_id, handler, latency)
+и могут выводиться в формате JSON (одна запись в строке).
+
+[EN]
+Logging setup module.
+
+The root logger gets only a QueueHandler that puts records into a queue
+without touching the disk. File writing and console output are done by
+a QueueListener in a separate thread, so log rotation and a slow disk
+do not block the event loop. Records are enriched with the fields of
+the update being processed (update_id, handler, latency) and can be
+output as JSON (one record per line).
+"""
+
+__all__ = ('JsonFormatter', 'bind', 'reset', 'setup_logging', 'shutdown_logging')
+
+import json
+import logging
+import os
+import queue
+from contextvars import ContextVar, Token
+from logging import StreamHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+from typing import Any, Optional
+
+from loader import Config
+
+LOG_DIR = Path('logs')
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+CONTEXT_FIELDS = ('update_id', 'handler', 'latency')
+
+_context: ContextVar[dict[str, Any]] = ContextVar('log_context', default={})
+_listener: Optional[QueueListener] = None
+
+
+def bind(**fields: Any) -> Token:
+    """
+    [RU]
+    Добавляет поля к записям логов текущего контекста (задачи asyncio).
+
+    Returns:
+        Token: Токен для восстановления предыдущих полей через reset()
+
+    [EN]
+    Adds fields to the log records of the current context (asyncio task).
+
+    Returns:
+        Token: Token for restoring the previous fields with reset()
+    """
+    return _context.set({**_context.get(), **fields})
+
+
+def reset(token: Token):
+    """
+    [RU]
+    Восстанавливает поля логов, действовавшие до вызова bind().
+
+    [EN]
+    Restores the log fields that were in effect before bind().
+    """
+    _context.reset(token)
+
+
+class _ContextFilter(logging.Filter):
+    # Выполняется в потоке, создавшем запись, до передачи её в очередь
+    # Runs in the thread that created the record, before it is queued
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    [RU]
+    Форматирует запись лога как строку JSON.
+
+    [EN]
+    Formats a log record as a JSON line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': record.processName,
+            'location': f'{record.filename}:{record.lineno}',
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _output_handlers(log_format: str) -> list[logging.Handler]:
+    if not LOG_DIR.exists():
+        LOG_DIR.mkdir()
+
+    file_handler = TimedRotatingFileHandler(
+        filename=os.path.join(LOG_DIR, 'bot'),
+        when='midnight',
+        interval=1,
+        backupCount=7,
+        encoding='utf-8'
+    )
+    file_handler.suffix = "%Y-%m-%d_%H-%M-%S"
+    file_handler.namer = lambda x: x + '.log'
+
+    formatter = JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [file_handler, StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(log_queue: Optional[Any] = None, listen: bool = True):
+    """
+    [RU]
+    Настраивает логирование через очередь.
+
+    Args:
+        log_queue: Очередь записей. По умолчанию создается очередь процесса;
+            в многопроцессном режиме передается общая multiprocessing.Queue.
+        listen (bool): Запускать ли поток записи логов. Процессы-обработчики
+            только отправляют записи в очередь супервизора.
+
+    [EN]
+    Configures logging through a queue.
+
+    Args:
+        log_queue: Record queue. A process-local queue is created by default;
+            in multi-process mode a shared multiprocessing.Queue is passed.
+        listen (bool): Whether to start the log writer thread. Worker
+            processes only send records to the supervisor queue.
+    """
+    global _listener
+
+    settings = Config().get_log_settings()
+    log_queue = log_queue if log_queue is not None else queue.SimpleQueue()
+
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(_ContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings['level'])
+    for name, level in settings['levels'].items():
+        logging.getLogger(name).setLevel(level)
+
+    if listen:
+        _listener = QueueListener(log_queue, *_output_handlers(settings['format']), respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging():
+    """
+    [RU]
+    Записывает оставшиеся в очереди записи и останавливает поток записи логов.
+
+    [EN]
+    Writes the records left in the queue and stops the log writer thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,127 @@
+"""
+[RU]
+Модуль отправки сообщений в чаты.
+
+Отправляет сообщение с учетом лимитов Telegram, повторяет отправку
+после RetryAfter и возвращает результат доставки, по которому
+очередь исходящих сообщений и рассылки решают, повторять ли отправку.
+
+[EN]
+Module for sending messages to chats.
+
+Sends a message within Telegram limits, retries after RetryAfter
+and returns the delivery result, which the outgoing message queue
+and broadcasts use to decide whether to retry.
+"""
+
+__all__ = ('DeliveryResult', 'send_message')
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError, TelegramForbiddenError, TelegramNetworkError, TelegramRetryAfter, TelegramServerError,
+)
+
+from utils.throttling import RateLimiter, limiter as default_limiter
+
+MAX_ATTEMPTS = 3
+
+
+@dataclass(slots=True)
+class DeliveryResult:
+    """
+    [RU]
+    Результат доставки сообщения в чат.
+
+    Attributes:
+        chat_id (int): ID чата
+        ok (bool): Доставлено ли сообщение
+        error (Optional[str]): Текст ошибки, если сообщение не доставлено
+        blocked (bool): Бот заблокирован пользователем или удален из чата
+        transient (bool): Ошибка временная (RetryAfter, сеть, 5xx) и отправку стоит повторить позже
+
+    [EN]
+    Message delivery result for a chat.
+
+    Attributes:
+        chat_id (int): Chat ID
+        ok (bool): Whether the message was delivered
+        error (Optional[str]): Error text if the message was not delivered
+        blocked (bool): The bot was blocked by the user or removed from the chat
+        transient (bool): The error is temporary (RetryAfter, network, 5xx) and sending should be retried later
+    """
+    chat_id: int
+    ok: bool
+    error: Optional[str] = None
+    blocked: bool = False
+    transient: bool = False
+
+
+async def send_message(bot: Bot, chat_id: int, text: str, limiter: RateLimiter = default_limiter,
+                       attempts: int = MAX_ATTEMPTS, **kwargs) -> DeliveryResult:
+    """
+    [RU]
+    Отправляет сообщение в чат с учетом лимитов и повторами.
+
+    Повторяет отправку после RetryAfter и сетевых ошибок,
+    остальные ошибки API не повторяются. Если бот заблокирован
+    или удален из чата, результат помечается как blocked.
+
+    Args:
+        bot (Bot): Объект бота
+        chat_id (int): ID чата
+        text (str): Текст сообщения
+        limiter (RateLimiter): Ограничитель частоты отправки
+        attempts (int): Максимальное количество попыток
+        **kwargs: Дополнительные параметры send_message
+
+    Returns:
+        DeliveryResult: Результат доставки
+
+    [EN]
+    Sends a message to a chat within limits and with retries.
+
+    Retries after RetryAfter and network errors,
+    other API errors are not retried. If the bot is blocked or
+    removed from the chat, the result is marked as blocked.
+
+    Args:
+        bot (Bot): Bot object
+        chat_id (int): Chat ID
+        text (str): Message text
+        limiter (RateLimiter): Sending rate limiter
+        attempts (int): Maximum number of attempts
+        **kwargs: Additional send_message parameters
+
+    Returns:
+        DeliveryResult: Delivery result
+    """
+    error = None
+    for attempt in range(1, attempts + 1):
+        await limiter.acquire(chat_id)
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+            return DeliveryResult(chat_id=chat_id, ok=True)
+        except TelegramRetryAfter as e:
+            error = e
+            logging.warning(f"Flood control для чата {chat_id}: повтор через {e.retry_after} с")
+            limiter.block(chat_id, e.retry_after)
+        except TelegramNetworkError as e:
+            error = e
+            await asyncio.sleep(attempt)
+        except TelegramForbiddenError as e:
+            logging.info(f"Чат {chat_id} недоступен для бота: {e}")
+            return DeliveryResult(chat_id=chat_id, ok=False, error=str(e), blocked=True)
+        except TelegramAPIError as e:
+            error = e
+            break
+
+    logging.error(f"Не удалось отправить сообщение в чат {chat_id}: {error}")
+    return DeliveryResult(
+        chat_id=chat_id, ok=False, error=str(error),
+        transient=isinstance(error, (TelegramRetryAfter, TelegramNetworkError, TelegramServerError)),
+    )
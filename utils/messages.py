@@ -0,0 +1,84 @@
+"""
+[RU]
+Модуль компактных ссылок на сообщения для хранения в состоянии FSM.
+
+Вместо целого объекта Message в данных состояния хранится только
+ID чата и ID сообщения, из которых при необходимости восстанавливается
+объект сообщения, привязанный к боту.
+
+[EN]
+Compact message references for storing in FSM state.
+
+Instead of a whole Message object the state data keeps only the chat ID
+and message ID, from which a bot-bound message object is restored
+when needed.
+"""
+
+__all__ = ('message_ref', 'restore_message')
+
+from datetime import datetime
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.enums import ChatType
+from aiogram.types import Chat, Message
+
+
+def message_ref(message: Message) -> dict:
+    """
+    [RU]
+    Возвращает компактную ссылку на сообщение.
+
+    Args:
+        message (Message): Объект сообщения Telegram
+
+    Returns:
+        dict: ID чата и ID сообщения
+
+    [EN]
+    Returns a compact message reference.
+
+    Args:
+        message (Message): Telegram message object
+
+    Returns:
+        dict: Chat ID and message ID
+    """
+    return {'chat_id': message.chat.id, 'message_id': message.message_id}
+
+
+def restore_message(bot: Bot, ref: Optional[dict]) -> Optional[Message]:
+    """
+    [RU]
+    Восстанавливает объект сообщения по ссылке.
+
+    Восстановленное сообщение содержит только ID чата и сообщения,
+    чего достаточно для edit_text, delete и answer.
+
+    Args:
+        bot (Bot): Объект бота
+        ref (Optional[dict]): Ссылка на сообщение
+
+    Returns:
+        Optional[Message]: Объект сообщения или None если ссылки нет
+
+    [EN]
+    Restores a message object from a reference.
+
+    The restored message holds only the chat and message IDs,
+    which is enough for edit_text, delete and answer.
+
+    Args:
+        bot (Bot): Bot object
+        ref (Optional[dict]): Message reference
+
+    Returns:
+        Optional[Message]: Message object or None if there is no reference
+    """
+    if not ref:
+        return None
+    return Message(
+        message_id=ref['message_id'],
+        chat=Chat(id=ref['chat_id'], type=ChatType.PRIVATE),
+        date=datetime.now(),
+    ).as_(bot)
@@ -0,0 +1,337 @@
+"""
+[RU]
+Модуль метрик бота.
+
+Реализует счетчики и гистограммы с метками, вывод их значений
+в текстовом формате Prometheus и HTTP-сервер, отдающий метрики
+по адресу /metrics.
+
+[EN]
+Bot metrics module.
+
+Implements labelled counters and histograms, rendering of their values
+in the Prometheus text format and an HTTP server exposing the metrics
+at /metrics.
+"""
+
+__all__ = ('Counter', 'Histogram', 'Registry', 'MetricsServer', 'registry', 'metrics_server')
+
+import bisect
+import logging
+from typing import Callable, Iterator, Optional
+
+from aiohttp import web
+
+# Границы корзин гистограмм задержки, сек / Latency histogram bucket bounds, s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+Sample = tuple[str, dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+    def _labels(self, values: tuple) -> dict[str, str]:
+        return dict(zip(self.labels, values))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    [RU]
+    Монотонно растущий счетчик.
+
+    [EN]
+    Monotonically increasing counter.
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        """
+        [RU]
+        Увеличивает счетчик.
+
+        Args:
+            *label_values (str): Значения меток в порядке их объявления
+            amount (float): Величина увеличения
+
+        [EN]
+        Increments the counter.
+
+        Args:
+            *label_values (str): Label values in declaration order
+            amount (float): Increment amount
+        """
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        for values, value in self._values.items():
+            yield self.name, self._labels(values), value
+
+
+class Histogram(_Metric):
+    """
+    [RU]
+    Гистограмма распределения значений (например, задержек).
+
+    [EN]
+    Histogram of value distribution (e.g. latencies).
+    """
+    kind = 'histogram'
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labels: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # На метки: счетчики корзин (последняя - +Inf), сумма
+        # Per labels: bucket counts (the last one is +Inf), sum
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        """
+        [RU]
+        Добавляет наблюдение.
+
+        Args:
+            value (float): Наблюдаемое значение
+            *label_values (str): Значения меток в порядке их объявления
+
+        [EN]
+        Adds an observation.
+
+        Args:
+            value (float): Observed value
+            *label_values (str): Label values in declaration order
+        """
+        entry = self._values.get(label_values)
+        if entry is None:
+            entry = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterator[Sample]:
+        for values, (counts, total) in self._values.items():
+            labels = self._labels(values)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, cumulative
+            yield f'{self.name}_sum', labels, total[0]
+            yield f'{self.name}_count', labels, cumulative
+
+
+class _Collector(_Metric):
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            kind: str,
+            labels: tuple[str, ...],
+            callback: Callable[[], dict[tuple, float]]
+    ):
+        super().__init__(name, documentation, labels)
+        self.kind = kind
+        self._callback = callback
+
+    def samples(self) -> Iterator[Sample]:
+        for values, value in self._callback().items():
+            yield self.name, self._labels(values), value
+
+
+class Registry:
+    """
+    [RU]
+    Реестр метрик процесса.
+
+    [EN]
+    Process metrics registry.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        """
+        [RU]
+        Создает и регистрирует счетчик.
+
+        [EN]
+        Creates and registers a counter.
+        """
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            labels: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """
+        [RU]
+        Создает и регистрирует гистограмму.
+
+        [EN]
+        Creates and registers a histogram.
+        """
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def collector(
+            self,
+            name: str,
+            documentation: str,
+            callback: Callable[[], dict[tuple, float]],
+            kind: str = 'gauge',
+            labels: tuple[str, ...] = ()
+    ):
+        """
+        [RU]
+        Регистрирует метрику, значения которой вычисляются при выводе.
+
+        Args:
+            name (str): Имя метрики
+            documentation (str): Описание метрики
+            callback: Функция, возвращающая значения по кортежам меток
+            kind (str): Тип метрики Prometheus (gauge или counter)
+            labels (tuple[str, ...]): Имена меток
+
+        [EN]
+        Registers a metric whose values are computed on render.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Metric description
+            callback: Function returning values by label tuples
+            kind (str): Prometheus metric type (gauge or counter)
+            labels (tuple[str, ...]): Label names
+        """
+        self._register(_Collector(name, documentation, kind, labels, callback))
+
+    def unregister(self, name: str):
+        """
+        [RU]
+        Удаляет метрику из реестра.
+
+        [EN]
+        Removes a metric from the registry.
+        """
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """
+        [RU]
+        Выводит все метрики в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст для ответа на запрос /metrics
+
+        [EN]
+        Renders all metrics in the Prometheus text format.
+
+        Returns:
+            str: Text for the /metrics response
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """
+    [RU]
+    HTTP-сервер, отдающий метрики реестра по адресу /metrics.
+
+    [EN]
+    HTTP server exposing registry metrics at /metrics.
+    """
+
+    def __init__(self, metrics: Registry):
+        self._registry = metrics
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=self._registry.render(), content_type='text/plain', charset='utf-8')
+
+    async def start(self, host: str, port: int):
+        """
+        [RU]
+        Запускает сервер метрик.
+
+        Args:
+            host (str): Адрес сервера
+            port (int): Порт сервера
+
+        [EN]
+        Starts the metrics server.
+
+        Args:
+            host (str): Server host
+            port (int): Server port
+        """
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=host, port=port).start()
+        logging.info(f"Метрики доступны по адресу http://{host}:{port}/metrics")
+
+    async def stop(self):
+        """
+        [RU]
+        Останавливает сервер метрик.
+
+        [EN]
+        Stops the metrics server.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+registry = Registry()
+metrics_server = MetricsServer(registry)
@@ -0,0 +1,154 @@
+"""
+[RU]
+Модуль фоновой доставки сообщений из очереди исходящих сообщений.
+
+Обработчики только добавляют сообщения в таблицу outbox, а пул фоновых
+задач доставляет их с повторами, не задерживая ответ пользователю.
+
+[EN]
+Background delivery module for the outgoing message queue.
+
+Handlers only add messages to the outbox table, and a pool of background
+tasks delivers them with retries without delaying the user response.
+"""
+
+__all__ = ('OutboxWorker', 'outbox')
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from aiogram import Bot
+
+from data.database import Outbox, get_db, get_due_messages, update_message
+from utils.mailing import send_message
+
+WORKERS = 4
+BATCH_SIZE = 50
+POLL_INTERVAL = 5
+MAX_BACKOFF = 3600
+
+
+class OutboxWorker:
+    """
+    [RU]
+    Пул фоновых задач доставки сообщений из очереди.
+
+    Опрашивает таблицу outbox (сразу после notify или раз в POLL_INTERVAL
+    секунд) и раздает сообщения задачам доставки. После временных ошибок
+    (RetryAfter, сеть, 5xx) отправка повторяется с экспоненциальной
+    задержкой без ограничения числа попыток, после постоянных ошибок
+    (4xx, бот заблокирован) сообщение помечается как failed.
+
+    [EN]
+    Pool of background tasks delivering queued messages.
+
+    Polls the outbox table (right after notify or every POLL_INTERVAL
+    seconds) and hands messages over to delivery tasks. After transient
+    errors (RetryAfter, network, 5xx) sending is retried with exponential
+    backoff and no attempt limit, after permanent errors (4xx, bot
+    blocked) the message is marked as failed.
+    """
+
+    def __init__(self, workers: int = WORKERS):
+        self.workers = workers
+        self._bot: Optional[Bot] = None
+        self._queue: asyncio.Queue[Outbox] = asyncio.Queue()
+        self._in_flight: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self, bot: Bot):
+        """
+        [RU]
+        Запускает опрос очереди и задачи доставки.
+
+        Args:
+            bot (Bot): Объект бота
+
+        [EN]
+        Starts queue polling and delivery tasks.
+
+        Args:
+            bot (Bot): Bot object
+        """
+        self._bot = bot
+        self._tasks = [asyncio.create_task(self._poll())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """
+        [RU]
+        Останавливает фоновые задачи. Недоставленные сообщения
+        остаются в базе данных и будут отправлены после перезапуска.
+
+        [EN]
+        Stops background tasks. Undelivered messages stay in
+        the database and will be sent after restart.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """
+        [RU]
+        Сообщает о новых сообщениях в очереди.
+
+        [EN]
+        Signals that new messages were queued.
+        """
+        self._wakeup.set()
+
+    async def _poll(self):
+        while True:
+            self._wakeup.clear()
+            messages = []
+            try:
+                async with get_db() as session:
+                    messages = await get_due_messages(session, BATCH_SIZE, self._in_flight)
+                for message in messages:
+                    self._in_flight.add(message.id)
+                    self._queue.put_nowait(message)
+            except Exception as e:
+                logging.error(f"Ошибка при чтении очереди сообщений: {e}")
+
+            if len(messages) == BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self):
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._deliver(message)
+            except Exception as e:
+                logging.error(f"Ошибка при доставке сообщения {message.id}: {e}")
+            finally:
+                self._in_flight.discard(message.id)
+                self._queue.task_done()
+
+    async def _deliver(self, message: Outbox):
+        result = await send_message(self._bot, message.chat_id, message.text, attempts=1)
+        attempts = message.attempts + 1
+
+        if result.ok:
+            values = dict(status='sent', attempts=attempts, last_error=None)
+        elif not result.transient:
+            logging.error(f"Сообщение {message.id} для чата {message.chat_id} не доставлено: {result.error}")
+            values = dict(status='failed', attempts=attempts, last_error=result.error)
+        else:
+            delay = min(2 ** min(attempts, 12), MAX_BACKOFF)
+            values = dict(attempts=attempts, last_error=result.error,
+                          next_attempt_at=datetime.utcnow() + timedelta(seconds=delay))
+
+        async with get_db() as session:
+            await update_message(session, message.id, **values)
+
+
+outbox = OutboxWorker()
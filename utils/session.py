@@ -0,0 +1,110 @@
+"""
+[RU]
+Модуль HTTP-сессии бота с метриками запросов к Telegram Bot API.
+
+Сессия измеряет время выполнения каждого метода API, считает ошибки,
+ограничения частоты (RetryAfter) и их длительность, размер запросов
+и ответов, а также позволяет настроить пул соединений и keep-alive.
+
+[EN]
+Bot HTTP session module with Telegram Bot API request metrics.
+
+The session measures the execution time of each API method, counts
+errors, flood waits (RetryAfter) and their duration, request and
+response sizes, and allows tuning the connection pool and keep-alive.
+"""
+
+__all__ = ('InstrumentedSession',)
+
+import time
+from typing import Any, Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from utils.metrics import registry
+
+api_latency = registry.histogram(
+    'bot_api_request_latency_seconds', 'Telegram Bot API request time', ('method',))
+api_errors_total = registry.counter(
+    'bot_api_errors_total', 'Failed Telegram Bot API requests', ('method', 'error'))
+api_retry_after_total = registry.counter(
+    'bot_api_retry_after_total', 'Flood wait (RetryAfter) responses', ('method',))
+api_retry_after_seconds_total = registry.counter(
+    'bot_api_retry_after_seconds_total', 'Requested flood wait duration', ('method',))
+api_request_bytes_total = registry.counter(
+    'bot_api_request_bytes_total', 'Telegram Bot API request body size', ('method',))
+api_response_bytes_total = registry.counter(
+    'bot_api_response_bytes_total', 'Telegram Bot API response body size', ('method',))
+
+
+class InstrumentedSession(AiohttpSession):
+    """
+    [RU]
+    Сессия aiohttp с метриками запросов к Telegram Bot API.
+
+    [EN]
+    aiohttp session with Telegram Bot API request metrics.
+    """
+
+    def __init__(
+            self,
+            limit: int = 100,
+            limit_per_host: int = 0,
+            keepalive_timeout: float = 15,
+            **kwargs: Any
+    ):
+        """
+        [RU]
+        Args:
+            limit (int): Максимальное количество одновременных соединений
+            limit_per_host (int): Максимум соединений с одним хостом, 0 - без ограничения
+            keepalive_timeout (float): Время жизни неактивного соединения, сек
+            **kwargs: Параметры AiohttpSession (например, timeout)
+
+        [EN]
+        Args:
+            limit (int): Maximum number of simultaneous connections
+            limit_per_host (int): Maximum connections to one host, 0 - unlimited
+            keepalive_timeout (float): Idle connection lifetime, s
+            **kwargs: AiohttpSession parameters (e.g. timeout)
+        """
+        super().__init__(limit=limit, **kwargs)
+        self._connector_init.update(limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout)
+
+    def build_form_data(self, bot: Bot, method: TelegramMethod[TelegramType]):
+        # Форма сериализуется здесь, чтобы узнать размер тела запроса;
+        # aiohttp принимает готовое тело так же, как FormData
+        # The form is serialized here to learn the request body size;
+        # aiohttp accepts a ready body the same way as FormData
+        payload = super().build_form_data(bot=bot, method=method)()
+        if payload.size is not None:
+            api_request_bytes_total.inc(method.__api_method__, amount=payload.size)
+        return payload
+
+    def check_response(
+            self, bot: Bot, method: TelegramMethod[TelegramType], status_code: int, content: str
+    ) -> Response[TelegramType]:
+        api_response_bytes_total.inc(method.__api_method__, amount=len(content.encode()))
+        try:
+            return super().check_response(bot=bot, method=method, status_code=status_code, content=content)
+        except TelegramRetryAfter as e:
+            api_retry_after_total.inc(method.__api_method__)
+            api_retry_after_seconds_total.inc(method.__api_method__, amount=e.retry_after)
+            raise
+
+    async def make_request(
+            self, bot: Bot, method: TelegramMethod[TelegramType], timeout: Optional[int] = None
+    ) -> TelegramType:
+        name = method.__api_method__
+        start = time.perf_counter()
+        try:
+            return await super().make_request(bot, method, timeout=timeout)
+        except Exception as e:
+            api_errors_total.inc(name, type(e).__name__)
+            raise
+        finally:
+            api_latency.observe(time.perf_counter() - start, name)
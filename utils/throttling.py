@@ -0,0 +1,222 @@
+"""
+[RU]
+Модуль ограничения частоты отправки сообщений.
+
+Реализует алгоритм token bucket и ограничитель, учитывающий общий лимит
+Telegram Bot API и лимиты для отдельных чатов.
+
+[EN]
+Message sending rate limiting module.
+
+Implements the token bucket algorithm and a limiter that respects
+both the global Telegram Bot API limit and per-chat limits.
+"""
+
+__all__ = ('TokenBucket', 'RateLimiter', 'ScopedLimiter', 'limiter')
+
+import asyncio
+import time
+
+# Лимиты Telegram / Telegram limits
+GLOBAL_RATE = 30            # сообщений в секунду на бота / messages per second per bot
+PRIVATE_CHAT_RATE = 1       # сообщение в секунду в личный чат / message per second per private chat
+GROUP_CHAT_RATE = 20 / 60   # 20 сообщений в минуту в группу / 20 messages per minute per group
+MAX_CHAT_BUCKETS = 10_000
+
+
+class TokenBucket:
+    """
+    [RU]
+    Ограничитель частоты по алгоритму token bucket.
+
+    Токены пополняются с постоянной скоростью до заданной емкости,
+    каждая отправка расходует один токен. Ожидающие обслуживаются
+    в порядке очереди.
+
+    [EN]
+    Token bucket rate limiter.
+
+    Tokens are refilled at a constant rate up to the given capacity,
+    each send consumes one token. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        [RU]
+        Args:
+            rate (float): Скорость пополнения, токенов в секунду
+            capacity (float): Максимальное количество токенов
+
+        [EN]
+        Args:
+            rate (float): Refill rate, tokens per second
+            capacity (float): Maximum number of tokens
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def is_full(self) -> bool:
+        """
+        [RU]
+        Заполнен ли bucket полностью (давно не использовался).
+
+        [EN]
+        Whether the bucket is full (has not been used for a while).
+        """
+        self._refill()
+        return self._tokens >= self.capacity and not self._lock.locked()
+
+    async def acquire(self):
+        """
+        [RU]
+        Ожидает и забирает один токен.
+
+        [EN]
+        Waits for and takes one token.
+        """
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def block(self, seconds: float):
+        """
+        [RU]
+        Блокирует выдачу токенов на заданное время (например, после RetryAfter).
+
+        Args:
+            seconds (float): Время блокировки в секундах
+
+        [EN]
+        Blocks token issuing for the given time (e.g. after RetryAfter).
+
+        Args:
+            seconds (float): Block time in seconds
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class RateLimiter:
+    """
+    [RU]
+    Ограничитель отправки сообщений с общим лимитом и лимитами по чатам.
+
+    [EN]
+    Message sending limiter with a global limit and per-chat limits.
+    """
+
+    def __init__(self, rate: float = GLOBAL_RATE):
+        """
+        [RU]
+        Args:
+            rate (float): Общий лимит, сообщений в секунду
+
+        [EN]
+        Args:
+            rate (float): Global limit, messages per second
+        """
+        self._global = TokenBucket(rate, capacity=rate)
+        self._chats: dict[int, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= MAX_CHAT_BUCKETS:
+                self._chats = {key: value for key, value in self._chats.items() if not value.is_full}
+            # ID групп и каналов отрицательные / group and channel IDs are negative
+            bucket = TokenBucket(GROUP_CHAT_RATE if chat_id < 0 else PRIVATE_CHAT_RATE)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id: int):
+        """
+        [RU]
+        Ожидает разрешения на отправку сообщения в чат.
+
+        Args:
+            chat_id (int): ID чата
+
+        [EN]
+        Waits for permission to send a message to the chat.
+
+        Args:
+            chat_id (int): Chat ID
+        """
+        await self._chat_bucket(chat_id).acquire()
+        await self._global.acquire()
+
+    def block(self, chat_id: int, seconds: float):
+        """
+        [RU]
+        Блокирует отправку в чат на заданное время.
+
+        Args:
+            chat_id (int): ID чата
+            seconds (float): Время блокировки в секундах
+
+        [EN]
+        Blocks sending to the chat for the given time.
+
+        Args:
+            chat_id (int): Chat ID
+            seconds (float): Block time in seconds
+        """
+        self._chat_bucket(chat_id).block(seconds)
+
+
+class ScopedLimiter:
+    """
+    [RU]
+    Ограничитель для фоновых задач с собственным лимитом поверх общего.
+
+    Отправка сначала ждет токен своего лимита, а затем - общего
+    ограничителя, поэтому фоновая задача занимает не больше своей доли
+    общего лимита и в очереди общего ограничителя находится не больше
+    одного ее ожидающего. RetryAfter блокирует и собственный лимит.
+
+    [EN]
+    Limiter for background tasks with its own limit on top of a shared one.
+
+    A send first waits for a token of its own limit and then of the shared
+    limiter, so the background task takes no more than its share of the
+    global limit and has at most one waiter in the shared limiter queue.
+    RetryAfter blocks the own limit as well.
+    """
+
+    def __init__(self, parent: RateLimiter, rate: float):
+        """
+        [RU]
+        Args:
+            parent (RateLimiter): Общий ограничитель
+            rate (float): Собственный лимит, сообщений в секунду
+
+        [EN]
+        Args:
+            parent (RateLimiter): Shared limiter
+            rate (float): Own limit, messages per second
+        """
+        self._parent = parent
+        self._bucket = TokenBucket(rate, capacity=1)
+
+    async def acquire(self, chat_id: int):
+        await self._bucket.acquire()
+        await self._parent.acquire(chat_id)
+
+    def block(self, chat_id: int, seconds: float):
+        self._bucket.block(seconds)
+        self._parent.block(chat_id, seconds)
+
+
+limiter = RateLimiter()